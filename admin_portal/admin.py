@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import AdminProfile, BirthdayTemplate, Communication
+from django.utils import timezone
+from .models import (
+    AdminProfile, BirthdayGreeting, BirthdayTemplate, Communication, DuplicateCandidate, OutboxMessage,
+)
 
 
 @admin.register(AdminProfile)
@@ -39,17 +42,49 @@ class BirthdayTemplateAdmin(admin.ModelAdmin):
 
 @admin.register(Communication)
 class CommunicationAdmin(admin.ModelAdmin):
-    list_display = ('title', 'communication_type', 'sender', 'sent_date', 'recipient_count')
-    list_filter = ('communication_type', 'sent_date')
+    list_display = ('title', 'communication_type', 'sender', 'sent_date', 'recipient_status', 'recipient_count')
+    list_filter = ('communication_type', 'sent_date', 'recipient_status')
     search_fields = ('title', 'message', 'sender__username')
-    readonly_fields = ('sent_date', 'sender')
+    readonly_fields = ('sent_date', 'sender', 'recipient_status', 'recipient_count')
     filter_horizontal = ('recipients',)
     
-    def recipient_count(self, obj):
-        return obj.recipients.count()
-    recipient_count.short_description = 'Recipients'
-    
     def save_model(self, request, obj, form, change):
         if not change:  # If creating new object
             obj.sender = request.user
         super().save_model(request, obj, form, change)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        obj = form.instance
+        obj.recipient_count = obj.recipients.count()
+        obj.save(update_fields=['recipient_count'])
+
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(admin.ModelAdmin):
+    list_display = ('alumni_a', 'alumni_b', 'score', 'status', 'detected_date')
+    list_filter = ('status',)
+    raw_id_fields = ('alumni_a', 'alumni_b', 'reviewed_by')
+    ordering = ('-score',)
+
+
+@admin.register(BirthdayGreeting)
+class BirthdayGreetingAdmin(admin.ModelAdmin):
+    list_display = ('alumni', 'birthday', 'email', 'status', 'attempts', 'sent_date')
+    list_filter = ('status', 'birthday')
+    raw_id_fields = ('alumni', 'template')
+    ordering = ('-birthday',)
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('channel', 'address', 'communication', 'status', 'attempts', 'next_attempt_date', 'sent_date')
+    list_filter = ('status', 'channel')
+    search_fields = ('address',)
+    raw_id_fields = ('communication', 'alumni')
+    actions = ['retry_now']
+
+    @admin.action(description='Retry selected messages now')
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(status='pending', next_attempt_date=timezone.now())
+        self.message_user(request, f"{updated} message(s) queued for retry.")
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class AdminPortalConfig(AppConfig):
+    name = 'admin_portal'
+
+    def ready(self):
+        """Import signals when the app is ready."""
+        import admin_portal.signals  # noqa: F401
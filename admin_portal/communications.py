@@ -0,0 +1,86 @@
+"""
+Recipient materialization for communications.
+
+Recipients are written to the ``Communication.recipients`` through table
+with a single ``INSERT ... SELECT`` built from the audience queryset, so the
+database copies the IDs itself instead of Django instantiating and inserting
+one row per alumnus. Audiences above ``INLINE_RECIPIENT_LIMIT`` are left
+queued for ``manage.py process_communications`` so the request returns
+immediately; the history page shows their status until they are ready.
+Once materialized, email and SMS deliveries are queued in the outbox.
+"""
+from django.db import connection, transaction
+
+from . import segments
+from .models import Communication
+from .outbox import enqueue_communication
+
+INLINE_RECIPIENT_LIMIT = 5000
+
+
+def audience_queryset(communication):
+    """Return the Alumni queryset a communication should be sent to."""
+    return segments.audience(communication.segments.all(), send_to_all=communication.send_to_all)
+
+
+def insert_recipients(communication, queryset):
+    """Copy the primary keys of ``queryset`` into the recipients table; returns the number of rows."""
+    through = Communication.recipients.through
+    qn = connection.ops.quote_name
+    sql, params = queryset.order_by().values_list('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {qn(through._meta.db_table)} ({qn('communication_id')}, {qn('alumni_id')}) "
+            f"SELECT %s, audience.{qn('id')} FROM ({sql}) audience",
+            (communication.pk, *params),
+        )
+        return cursor.rowcount
+
+
+def materialize_recipients(communication):
+    """Replace a communication's recipients with its audience in one transaction."""
+    Communication.objects.filter(pk=communication.pk).update(recipient_status='processing')
+    try:
+        with transaction.atomic():
+            communication.recipients.clear()
+            count = insert_recipients(communication, audience_queryset(communication))
+            enqueue_communication(communication)
+            communication.recipient_status = 'ready'
+            communication.recipient_count = count
+            communication.save(update_fields=['recipient_status', 'recipient_count'])
+    except Exception:
+        Communication.objects.filter(pk=communication.pk).update(recipient_status='failed')
+        raise
+    return count
+
+
+def schedule_recipients(communication):
+    """
+    Materialize small audiences now and queue large ones for the background command.
+
+    Returns True when the recipients were materialized inline.
+    """
+    expected = audience_queryset(communication).count()
+    if expected <= INLINE_RECIPIENT_LIMIT:
+        materialize_recipients(communication)
+        return True
+    communication.recipient_status = 'queued'
+    communication.recipient_count = expected
+    communication.save(update_fields=['recipient_status', 'recipient_count'])
+    return False
+
+
+def process_queued(limit=None):
+    """Materialize queued communications, oldest first; returns how many were processed."""
+    processed = 0
+    queued = Communication.objects.filter(recipient_status='queued').order_by('sent_date')
+    if limit:
+        queued = queued[:limit]
+    for communication in queued:
+        # Claim the row so concurrent workers don't materialize it twice
+        claimed = Communication.objects.filter(pk=communication.pk, recipient_status='queued') \
+            .update(recipient_status='processing')
+        if claimed:
+            materialize_recipients(communication)
+            processed += 1
+    return processed
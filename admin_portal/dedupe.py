@@ -0,0 +1,271 @@
+"""
+Duplicate alumni detection.
+
+Comparing every pair of records is quadratic, so records are first grouped
+by cheap *blocking keys* (normalized name plus graduation year, phone number,
+date of birth, national ID). Only records that share at least one key are
+scored against each other, using fuzzy name similarity plus exact matches on
+the identifying fields. Keys are persisted in ``AlumniBlockingKey`` so new
+registrations can be checked against the existing index incrementally.
+Editing a field the keys are built from drops the record's keys (see
+admin_portal/signals.py), so the next incremental run checks it again.
+"""
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from alumni.models import Alumni
+from alumni.search import normalize_text
+from .models import AlumniBlockingKey, DuplicateCandidate
+
+DEDUPE_FIELDS = (
+    'id', 'first_name', 'last_name', 'maiden_name', 'graduation_year',
+    'mobile_number', 'date_of_birth', 'national_id_key',
+)
+
+# Alumni fields the blocking keys and scores are built from
+KEY_FIELDS = set(DEDUPE_FIELDS) - {'id'}
+
+# Blocks bigger than this are too generic to be useful and are skipped
+MAX_BLOCK_SIZE = 200
+MIN_SCORE = 0.6
+
+WEIGHTS = {
+    'name': 0.45,
+    'national_id': 0.2,
+    'phone': 0.15,
+    'date_of_birth': 0.1,
+    'graduation_year': 0.1,
+}
+
+_DIGITS = re.compile(r'\D+')
+
+
+class Record:
+    """Lightweight projection of an Alumni row used for comparisons."""
+    __slots__ = ('pk', 'names', 'graduation_year', 'phone', 'date_of_birth', 'national_id_key')
+
+    def __init__(self, pk, first_name, last_name, maiden_name, graduation_year,
+                 mobile_number, date_of_birth, national_id_key):
+        first = normalize_text(first_name)
+        self.pk = pk
+        self.names = {f'{first} {normalize_text(last_name)}'.strip()}
+        if maiden_name:
+            self.names.add(f'{first} {normalize_text(maiden_name)}'.strip())
+        self.graduation_year = graduation_year
+        self.phone = _DIGITS.sub('', mobile_number or '')[-9:]
+        self.date_of_birth = date_of_birth
+        self.national_id_key = national_id_key
+
+
+def load_records(queryset):
+    """Stream Record objects for a queryset of Alumni."""
+    for row in queryset.values_list(*DEDUPE_FIELDS).iterator(chunk_size=5000):
+        yield Record(*row)
+
+
+def blocking_keys(record):
+    """Return the set of blocking keys for a record."""
+    keys = set()
+    for name in record.names:
+        tokens = name.split()
+        if not tokens:
+            continue
+        # Token-sorted full name catches swapped first/last names
+        keys.add(f"name:{' '.join(sorted(tokens))}|{record.graduation_year}")
+        # Surname plus first initial tolerates first-name typos and nicknames
+        keys.add(f"surname:{tokens[-1]}|{tokens[0][0]}|{record.graduation_year}")
+    if len(record.phone) >= 7:
+        keys.add(f'phone:{record.phone}')
+    if record.date_of_birth:
+        keys.add(f'dob:{record.date_of_birth.isoformat()}')
+    if record.national_id_key:
+        keys.add(f'nid:{record.national_id_key}')
+    return keys
+
+
+def score_pair(a, b, min_score=0.0):
+    """
+    Score how likely two records are the same person; returns ``(score, reasons)``.
+
+    Exact-field matches are scored first so pairs that cannot reach
+    ``min_score`` even with identical names skip the fuzzy comparison.
+    """
+    score = 0.0
+    reasons = []
+    if a.national_id_key and a.national_id_key == b.national_id_key:
+        score += WEIGHTS['national_id']
+        reasons.append('national id')
+    if a.phone and a.phone == b.phone:
+        score += WEIGHTS['phone']
+        reasons.append('phone')
+    if a.date_of_birth and a.date_of_birth == b.date_of_birth:
+        score += WEIGHTS['date_of_birth']
+        reasons.append('date of birth')
+    if a.graduation_year == b.graduation_year:
+        score += WEIGHTS['graduation_year']
+        reasons.append('graduation year')
+
+    needed = (min_score - score) / WEIGHTS['name']
+    if needed > 1:
+        return score, ', '.join(reasons)
+    name_similarity = 0.0
+    for name_a in a.names:
+        for name_b in b.names:
+            matcher = SequenceMatcher(None, name_a, name_b)
+            if matcher.real_quick_ratio() >= needed and matcher.quick_ratio() >= needed:
+                name_similarity = max(name_similarity, matcher.ratio())
+    score += WEIGHTS['name'] * name_similarity
+    reasons.insert(0, f'name {name_similarity:.2f}')
+    return score, ', '.join(reasons)
+
+
+def _pair(a, b):
+    return (a.pk, b.pk) if a.pk < b.pk else (b.pk, a.pk)
+
+
+def find_duplicates_full(min_score=MIN_SCORE):
+    """
+    Rebuild the blocking-key index for every alumnus and score all in-block pairs.
+
+    Returns ``(candidates, stats)`` where candidates maps ``(pk_a, pk_b)`` to
+    ``(score, reasons)``.
+    """
+    records = {}
+    blocks = defaultdict(list)
+    for record in load_records(Alumni.objects.all()):
+        records[record.pk] = record
+        for key in blocking_keys(record):
+            blocks[key].append(record.pk)
+
+    candidates = {}
+    compared = set()
+    skipped_blocks = 0
+    for key, members in blocks.items():
+        if len(members) < 2:
+            continue
+        if len(members) > MAX_BLOCK_SIZE:
+            skipped_blocks += 1
+            continue
+        for pk_a, pk_b in combinations(members, 2):
+            pair = _pair(records[pk_a], records[pk_b])
+            if pair in compared:
+                continue
+            compared.add(pair)
+            score, reasons = score_pair(records[pk_a], records[pk_b], min_score)
+            if score >= min_score:
+                candidates[pair] = (score, reasons)
+
+    with transaction.atomic():
+        AlumniBlockingKey.objects.all().delete()
+        AlumniBlockingKey.objects.bulk_create(
+            (AlumniBlockingKey(key=key, alumni_id=pk) for key, members in blocks.items() for pk in members),
+            batch_size=5000,
+        )
+
+    stats = {'records': len(records), 'comparisons': len(compared), 'skipped_blocks': skipped_blocks,
+             'checked': None}
+    return candidates, stats
+
+
+def find_duplicates_incremental(min_score=MIN_SCORE, chunk_size=500):
+    """
+    Check alumni that are not in the blocking-key index yet against the indexed ones.
+
+    New (and edited, see admin_portal/signals.py) records are compared with
+    existing records sharing a key and with each other, then their keys are
+    added to the index.
+    """
+    new_records = {r.pk: r for r in load_records(Alumni.objects.filter(blocking_keys__isnull=True))}
+    new_keys = {pk: blocking_keys(record) for pk, record in new_records.items()}
+
+    blocks = defaultdict(list)
+    for pk, keys in new_keys.items():
+        for key in keys:
+            blocks[key].append(pk)
+
+    all_keys = list(blocks)
+    for start in range(0, len(all_keys), chunk_size):
+        chunk = all_keys[start:start + chunk_size]
+        for key, pk in AlumniBlockingKey.objects.filter(key__in=chunk).values_list('key', 'alumni_id'):
+            blocks[key].append(pk)
+
+    existing_ids = {pk for members in blocks.values() for pk in members} - set(new_records)
+    records = dict(new_records)
+    existing_list = list(existing_ids)
+    for start in range(0, len(existing_list), chunk_size):
+        chunk = existing_list[start:start + chunk_size]
+        records.update((r.pk, r) for r in load_records(Alumni.objects.filter(pk__in=chunk)))
+
+    candidates = {}
+    compared = set()
+    skipped_blocks = 0
+    for members in blocks.values():
+        if len(members) > MAX_BLOCK_SIZE:
+            skipped_blocks += 1
+            continue
+        for pk_a, pk_b in combinations(members, 2):
+            if pk_a not in new_records and pk_b not in new_records:
+                continue
+            pair = _pair(records[pk_a], records[pk_b])
+            if pair in compared:
+                continue
+            compared.add(pair)
+            score, reasons = score_pair(records[pk_a], records[pk_b], min_score)
+            if score >= min_score:
+                candidates[pair] = (score, reasons)
+
+    AlumniBlockingKey.objects.bulk_create(
+        (AlumniBlockingKey(key=key, alumni_id=pk) for pk, keys in new_keys.items() for key in keys),
+        batch_size=5000,
+    )
+
+    stats = {'records': len(new_records), 'comparisons': len(compared), 'skipped_blocks': skipped_blocks,
+             'checked': set(new_records)}
+    return candidates, stats
+
+
+def clear_stale_candidates(candidates, checked=None, chunk_size=1000):
+    """
+    Delete pending pairs that were not found again; returns the number deleted.
+
+    Only pairs involving an alumnus in ``checked`` are considered, or every
+    pending pair when ``checked`` is None (a full run). Reviewed pairs are kept.
+    """
+    pending = DuplicateCandidate.objects.filter(status='pending')
+    if checked is None:
+        rows = pending.values_list('pk', 'alumni_a_id', 'alumni_b_id').iterator(chunk_size=5000)
+    else:
+        checked = list(checked)
+        rows = []
+        for start in range(0, len(checked), chunk_size):
+            chunk = checked[start:start + chunk_size]
+            rows.extend(pending.filter(Q(alumni_a__in=chunk) | Q(alumni_b__in=chunk))
+                        .values_list('pk', 'alumni_a_id', 'alumni_b_id'))
+    stale = list({pk for pk, pk_a, pk_b in rows if (pk_a, pk_b) not in candidates})
+    for start in range(0, len(stale), chunk_size):
+        DuplicateCandidate.objects.filter(pk__in=stale[start:start + chunk_size]).delete()
+    return len(stale)
+
+
+def save_candidates(candidates):
+    """Upsert candidate pairs, keeping the review status of pairs seen before."""
+    now = timezone.now()
+    rows = [
+        DuplicateCandidate(alumni_a_id=pk_a, alumni_b_id=pk_b, score=round(score, 4),
+                           reasons=reasons[:200], detected_date=now)
+        for (pk_a, pk_b), (score, reasons) in candidates.items()
+    ]
+    DuplicateCandidate.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['alumni_a', 'alumni_b'],
+        update_fields=['score', 'reasons'],
+    )
+    return len(rows)
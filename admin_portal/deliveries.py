@@ -0,0 +1,88 @@
+"""
+Per-recipient delivery status.
+
+``Delivery`` keeps one small row per (communication, recipient) with a
+small-int status code. Status changes are applied in bulk: the affected
+rows are locked and counted by their current status, moved with a single
+UPDATE, and the per-communication counters are adjusted with one
+``F()``-expression UPDATE. The history page reads only those counters.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Communication, Delivery
+
+# Which statuses each status may be reached from; anything else is ignored
+# (e.g. a late "sent" report never overwrites "opened")
+ALLOWED_FROM = {
+    Delivery.SENT: {Delivery.QUEUED, Delivery.FAILED},
+    Delivery.BOUNCED: {Delivery.QUEUED, Delivery.SENT},
+    Delivery.FAILED: {Delivery.QUEUED},
+    Delivery.OPENED: {Delivery.SENT},
+}
+
+COUNTER_FIELDS = {
+    Delivery.QUEUED: 'queued_count',
+    Delivery.SENT: 'sent_count',
+    Delivery.BOUNCED: 'bounced_count',
+    Delivery.FAILED: 'failed_count',
+    Delivery.OPENED: 'opened_count',
+}
+
+CHUNK_SIZE = 2000
+
+
+def _apply_counters(communication_id, deltas):
+    changes = {COUNTER_FIELDS[status]: F(COUNTER_FIELDS[status]) + delta for status, delta in deltas.items() if delta}
+    if changes:
+        Communication.objects.filter(pk=communication_id).update(**changes)
+
+
+def create_deliveries(communication, statuses):
+    """
+    Record the initial status of each recipient.
+
+    ``statuses`` is an iterable of ``(alumni_id, status)``.
+    """
+    counts = Counter()
+    batch = []
+    for alumni_id, status in statuses:
+        batch.append(Delivery(communication=communication, alumni_id=alumni_id, status=status))
+        counts[status] += 1
+        if len(batch) >= CHUNK_SIZE:
+            Delivery.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Delivery.objects.bulk_create(batch)
+    _apply_counters(communication.pk, counts)
+
+
+def transition(communication_id, alumni_ids, status):
+    """Move recipients of a communication to ``status``; returns the number of rows changed."""
+    alumni_ids = list(alumni_ids)
+    if not alumni_ids:
+        return 0
+    allowed = ALLOWED_FROM[status]
+    with transaction.atomic():
+        rows = (
+            Delivery.objects
+            .select_for_update()
+            .filter(communication_id=communication_id, alumni_id__in=alumni_ids, status__in=allowed)
+        )
+        before = Counter(rows.values_list('status', flat=True))
+        if not before:
+            return 0
+        changed = Delivery.objects.filter(
+            communication_id=communication_id, alumni_id__in=alumni_ids, status__in=allowed
+        ).update(status=status)
+        deltas = Counter({old: -n for old, n in before.items()})
+        deltas[status] += changed
+        _apply_counters(communication_id, deltas)
+    return changed
+
+
+def transition_many(changes, status):
+    """Apply ``transition`` for a ``{communication_id: [alumni_id, ...]}`` mapping."""
+    return sum(transition(communication_id, alumni_ids, status) for communication_id, alumni_ids in changes.items())
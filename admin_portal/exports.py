@@ -0,0 +1,73 @@
+"""
+Streaming alumni exports.
+
+Rows are read through a server-side cursor (``QuerySet.iterator``) as plain
+tuples and encoded a buffer at a time, so memory use stays flat no matter how
+many rows are exported.
+"""
+import csv
+import io
+import json
+import zlib
+
+EXPORT_FIELDS = (
+    'id', 'salutation', 'first_name', 'last_name', 'maiden_name', 'gender',
+    'date_of_birth', 'email', 'mobile_number', 'city', 'country', 'reg_number',
+    'programme_studied', 'graduation_year', 'degree_level', 'employment_status',
+    'current_employer', 'job_title', 'industry', 'is_verified', 'registration_date',
+)
+
+CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+
+def _as_text(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def iter_rows(queryset, fields=EXPORT_FIELDS):
+    """Yield export rows as tuples, streamed from the database in chunks."""
+    return queryset.order_by('pk').values_list(*fields).iterator(chunk_size=CHUNK_SIZE)
+
+
+def iter_csv(rows, fields=EXPORT_FIELDS):
+    """Encode rows as CSV, yielding roughly FLUSH_BYTES at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for row in rows:
+        writer.writerow([_as_text(value) for value in row])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def iter_jsonl(rows, fields=EXPORT_FIELDS):
+    """Encode rows as JSON Lines, yielding roughly FLUSH_BYTES at a time."""
+    parts = []
+    size = 0
+    for row in rows:
+        line = json.dumps({field: _as_text(value) for field, value in zip(fields, row)}, default=str) + '\n'
+        parts.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield ''.join(parts).encode('utf-8')
+            parts = []
+            size = 0
+    yield ''.join(parts).encode('utf-8')
+
+
+def gzip_stream(chunks):
+    """Gzip-compress a stream of byte chunks on the fly."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
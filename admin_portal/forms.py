@@ -1,6 +1,13 @@
+import datetime
+
 from django import forms
-from alumni.models import Newsletter, Event
-from .models import Communication, BirthdayTemplate
+from django.db.models import Q
+from django.utils import timezone
+from alumni.models import Alumni, AuditLog, Newsletter, Event
+from alumni.audit import UNAUDITED_FIELDS
+from alumni.rollups import SERIES_GROUPS, SERIES_INTERVALS
+from alumni.interests import INTEREST_LABELS
+from .models import AudienceSegment, Communication, BirthdayTemplate
 from django.contrib.auth.forms import AuthenticationForm
 
 
@@ -22,13 +29,14 @@ class NewsletterForm(forms.ModelForm):
 class EventForm(forms.ModelForm):
     class Meta:
         model = Event
-        fields = ['title', 'description', 'date', 'location', 'is_virtual', 'virtual_link', 'registration_required', 'image']
+        fields = ['title', 'description', 'date', 'location', 'is_virtual', 'virtual_link', 'registration_required', 'capacity', 'image']
         widgets = {
             'title': forms.TextInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'}),
             'description': forms.Textarea(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md', 'rows': 5}),
             'date': forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'w-full p-2 border border-gray-300 rounded-md'}),
             'location': forms.TextInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'}),
             'virtual_link': forms.URLInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'}),
+            'capacity': forms.NumberInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md', 'min': 1}),
         }
 
 
@@ -37,14 +45,148 @@ class CommunicationForm(forms.ModelForm):
     
     class Meta:
         model = Communication
-        fields = ['title', 'message', 'communication_type']
+        fields = ['title', 'message', 'communication_type', 'segments']
         widgets = {
+            'segments': forms.CheckboxSelectMultiple(),
             'title': forms.TextInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'}),
             'message': forms.Textarea(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md', 'rows': 5}),
             'communication_type': forms.Select(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'}),
         }
 
 
+class CommaSeparatedField(forms.CharField):
+    """Text input holding a comma-separated list of values."""
+    def prepare_value(self, value):
+        if isinstance(value, (list, tuple)):
+            return ', '.join(value)
+        return value
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class AudienceSegmentForm(forms.ModelForm):
+    countries = CommaSeparatedField(
+        required=False,
+        help_text="Comma-separated, e.g. Zimbabwe, South Africa",
+        widget=forms.TextInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'})
+    )
+    programmes = CommaSeparatedField(
+        required=False,
+        help_text="Comma-separated programme names",
+        widget=forms.TextInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'})
+    )
+    degree_levels = forms.MultipleChoiceField(
+        required=False, choices=Alumni.DEGREE_LEVELS, widget=forms.CheckboxSelectMultiple()
+    )
+    employment_statuses = forms.MultipleChoiceField(
+        required=False, choices=Alumni.EMPLOYMENT_STATUS_CHOICES, widget=forms.CheckboxSelectMultiple()
+    )
+    interests = forms.MultipleChoiceField(
+        required=False, choices=list(INTEREST_LABELS.items()), widget=forms.CheckboxSelectMultiple(),
+        help_text="Alumni must have selected all of these"
+    )
+
+    class Meta:
+        model = AudienceSegment
+        fields = [
+            'name', 'countries', 'graduation_year_from', 'graduation_year_to', 'degree_levels',
+            'programmes', 'employment_statuses', 'interests', 'verified_only',
+        ]
+        widgets = {
+            'name': forms.TextInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'}),
+            'graduation_year_from': forms.NumberInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'}),
+            'graduation_year_to': forms.NumberInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'}),
+        }
+
+    def clean(self):
+        cleaned_data = super().clean()
+        year_from, year_to = cleaned_data.get('graduation_year_from'), cleaned_data.get('graduation_year_to')
+        if year_from and year_to and year_from > year_to:
+            raise forms.ValidationError("The graduation year range is reversed.")
+        return cleaned_data
+
+
+class AlumniFilterForm(forms.Form):
+    """Server-side filters and sort order for the admin alumni list."""
+    SORT_CHOICES = [
+        ('-registration_date', 'Newest first'),
+        ('registration_date', 'Oldest first'),
+        ('last_name', 'Last name (A-Z)'),
+        ('-last_name', 'Last name (Z-A)'),
+        ('-graduation_year', 'Graduation year (newest)'),
+        ('graduation_year', 'Graduation year (oldest)'),
+    ]
+    STATUS_CHOICES = [
+        ('', 'All'),
+        ('verified', 'Verified'),
+        ('pending', 'Pending'),
+    ]
+
+    search = forms.CharField(
+        required=False,
+        max_length=200,
+        widget=forms.TextInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md', 'placeholder': 'Name, Programme, Employer, City...'})
+    )
+    graduation_year = forms.IntegerField(
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md', 'placeholder': 'Any'})
+    )
+    country = forms.CharField(
+        required=False,
+        max_length=100,
+        widget=forms.TextInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md', 'placeholder': 'Any'})
+    )
+    degree_level = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All')] + Alumni.DEGREE_LEVELS,
+        widget=forms.Select(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'})
+    )
+    employment_status = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All')] + Alumni.EMPLOYMENT_STATUS_CHOICES,
+        widget=forms.Select(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'})
+    )
+    status = forms.ChoiceField(
+        required=False,
+        choices=STATUS_CHOICES,
+        label='Verification Status',
+        widget=forms.Select(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'})
+    )
+    sort = forms.ChoiceField(
+        required=False,
+        choices=SORT_CHOICES,
+        widget=forms.Select(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'})
+    )
+
+    def filter_queryset(self, queryset):
+        """Apply the validated filters to an Alumni queryset."""
+        data = self.cleaned_data if self.is_valid() else {}
+        if data.get('graduation_year'):
+            queryset = queryset.filter(graduation_year=data['graduation_year'])
+        if data.get('country'):
+            queryset = queryset.filter(country=data['country'].strip())
+        if data.get('degree_level'):
+            queryset = queryset.filter(degree_level=data['degree_level'])
+        if data.get('employment_status'):
+            queryset = queryset.filter(employment_status=data['employment_status'])
+        if data.get('status') == 'verified':
+            queryset = queryset.filter(is_verified=True)
+        elif data.get('status') == 'pending':
+            queryset = queryset.filter(is_verified=False)
+        return queryset
+
+    def get_search(self):
+        """Return the free-text search query, if any."""
+        return (self.cleaned_data.get('search') if self.is_valid() else '') or ''
+
+    def get_sort(self):
+        """Return ``(field_name, descending)`` for the selected sort order."""
+        sort = (self.cleaned_data.get('sort') if self.is_valid() else '') or '-registration_date'
+        return sort.lstrip('-'), sort.startswith('-')
+
+
 class BirthdayTemplateForm(forms.ModelForm):
     class Meta:
         model = BirthdayTemplate
@@ -75,3 +217,96 @@ class BirthdayTemplateForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.fields['message'].help_text = 'Use {name} for alumni name and {birthday_date} for birthday date in your template.'
+
+
+class RegistrationAnalyticsForm(forms.Form):
+    """Date range and bucketing options for the registration time series."""
+    GROUP_CHOICES = [
+        ('none', 'All registrations'),
+        ('graduation_year', 'Graduation year'),
+        ('programme', 'Programme'),
+        ('cohort', 'Graduation year and programme'),
+    ]
+
+    start = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    end = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    interval = forms.ChoiceField(choices=[(i, i.title()) for i in SERIES_INTERVALS], required=False)
+    group_by = forms.ChoiceField(choices=GROUP_CHOICES, required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get('start'), cleaned_data.get('end')
+        if start and end and start > end:
+            raise forms.ValidationError("The start date must be before the end date.")
+        cleaned_data['interval'] = cleaned_data.get('interval') or 'month'
+        if cleaned_data.get('group_by') not in SERIES_GROUPS:
+            cleaned_data['group_by'] = 'none'
+        return cleaned_data
+
+
+class AuditLogFilterForm(forms.Form):
+    """Filters for the audit trail browser."""
+    FIELD_CHOICES = [('', 'Any field')] + [
+        (field.name, field.verbose_name.capitalize())
+        for field in Alumni._meta.concrete_fields if field.name not in UNAUDITED_FIELDS
+    ]
+
+    alumni = forms.CharField(
+        required=False,
+        max_length=254,
+        widget=forms.TextInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md', 'placeholder': 'ID, email or reg number'})
+    )
+    action = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All')] + AuditLog.ACTION_TYPES,
+        widget=forms.Select(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'})
+    )
+    changed_field = forms.ChoiceField(
+        required=False,
+        choices=FIELD_CHOICES,
+        widget=forms.Select(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'})
+    )
+    start = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'w-full p-2 border border-gray-300 rounded-md'})
+    )
+    end = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'w-full p-2 border border-gray-300 rounded-md'})
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get('start'), cleaned_data.get('end')
+        if start and end and start > end:
+            raise forms.ValidationError("The start date must be before the end date.")
+        return cleaned_data
+
+    def filter_queryset(self, queryset):
+        """Apply the validated filters to an AuditLog queryset."""
+        data = self.cleaned_data if self.is_valid() else {}
+        alumni = (data.get('alumni') or '').strip()
+        if alumni:
+            match = Q(email__iexact=alumni) | Q(reg_number__iexact=alumni)
+            # Entries of deleted records carry the id and registration number themselves
+            unlinked = Q(changed_fields__reg_number__iexact=alumni)
+            if alumni.isdigit():
+                match |= Q(pk=int(alumni))
+                unlinked |= Q(changed_fields__alumni_id=int(alumni))
+            queryset = queryset.filter(
+                Q(alumni__in=Alumni.objects.filter(match).values('pk')) | Q(alumni__isnull=True) & unlinked
+            )
+        if data.get('action'):
+            queryset = queryset.filter(action=data['action'])
+        if data.get('changed_field'):
+            queryset = queryset.filter(changed_fields__has_key=data['changed_field'])
+        # Compare against datetimes so the (alumni, timestamp) index can be used
+        if data.get('start'):
+            queryset = queryset.filter(timestamp__gte=self._day_start(data['start']))
+        if data.get('end'):
+            queryset = queryset.filter(timestamp__lt=self._day_start(data['end'] + datetime.timedelta(days=1)))
+        return queryset
+
+    @staticmethod
+    def _day_start(day):
+        return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
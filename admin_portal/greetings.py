@@ -0,0 +1,143 @@
+"""
+Birthday greeting dispatch.
+
+Greetings are queued as ``BirthdayGreeting`` rows, unique per alumnus and
+day, so queueing the same day twice is a no-op and a re-run only sends what
+is still queued, or failed with fewer than ``MAX_ATTEMPTS`` tries. Each
+month's template is rendered once per distinct birthday date with a
+placeholder for the name, which is the only part that differs between
+recipients.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from alumni.birthdays import birthdays_on
+from alumni.models import Alumni
+from .models import BirthdayGreeting, BirthdayTemplate
+
+CHUNK_SIZE = 500
+MAX_ATTEMPTS = 5
+# How long a claimed chunk stays reserved before another run may take it over
+CLAIM_LEASE = timedelta(minutes=15)
+DEFAULT_SUBJECT = "Happy Birthday!"
+FALLBACK_MESSAGE = "Happy Birthday {name}! 🎉"
+
+# Stand-in for the recipient's name while a template is rendered once for many people
+NAME_SLOT = '\x00name\x00'
+
+
+def compile_message(template, date_of_birth):
+    """Render a template for everyone sharing a birthday; returns ``(subject, message)``."""
+    text = template.message if template else FALLBACK_MESSAGE
+    birthday_date = date_of_birth.strftime("%B %d")
+    try:
+        message = text.format(name=NAME_SLOT, birthday_date=birthday_date)
+    except (AttributeError, KeyError, IndexError, ValueError):
+        # Same fallback as the format_birthday_message template filter
+        message = FALLBACK_MESSAGE.format(name=NAME_SLOT)
+    return (template.title if template else DEFAULT_SUBJECT), message
+
+
+def queue_greetings(day, chunk_size=CHUNK_SIZE):
+    """Queue a greeting for everyone celebrating on ``day`` not yet greeted; returns the number queued."""
+    templates = {t.month: t for t in BirthdayTemplate.objects.filter(is_active=True)}
+    template = templates.get(day.month)
+    compiled = {}
+
+    celebrants = (
+        birthdays_on(Alumni.objects.exclude(email=''), day)
+        .exclude(birthday_greetings__birthday=day)
+        .values_list('id', 'first_name', 'last_name', 'email', 'date_of_birth')
+        .order_by('id')
+    )
+    queued = 0
+    batch = []
+    for pk, first_name, last_name, email, date_of_birth in celebrants.iterator(chunk_size=chunk_size):
+        key = (date_of_birth.month, date_of_birth.day)
+        if key not in compiled:
+            compiled[key] = compile_message(template, date_of_birth)
+        subject, message = compiled[key]
+        name = f"{first_name} {last_name}".strip()
+        batch.append(BirthdayGreeting(
+            alumni_id=pk, birthday=day, template=template, email=email,
+            subject=subject, message=message.replace(NAME_SLOT, name),
+        ))
+        if len(batch) >= chunk_size:
+            # The unique constraint makes a concurrent run's rows win instead of duplicating
+            BirthdayGreeting.objects.bulk_create(batch, ignore_conflicts=True)
+            queued += len(batch)
+            batch = []
+    if batch:
+        BirthdayGreeting.objects.bulk_create(batch, ignore_conflicts=True)
+        queued += len(batch)
+    return queued
+
+
+def claim_greetings(day, after_id=0, chunk_size=CHUNK_SIZE, lease=CLAIM_LEASE):
+    """
+    Claim the next chunk of sendable greetings for ``day`` and commit the claim.
+
+    Sendable means queued, failed with attempts to spare, or claimed by a run
+    whose lease has expired (e.g. one that was killed mid-chunk).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        greetings = list(
+            BirthdayGreeting.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status__in=['queued', 'failed'], attempts__lt=MAX_ATTEMPTS)
+                | Q(status='sending', attempted_date__lt=now - lease),
+                birthday=day, pk__gt=after_id,
+            )
+            .order_by('pk')[:chunk_size]
+        )
+        if greetings:
+            BirthdayGreeting.objects.filter(pk__in=[g.pk for g in greetings]).update(
+                status='sending', attempted_date=now, attempts=F('attempts') + 1,
+            )
+    for greeting in greetings:
+        greeting.attempts += 1
+    return greetings
+
+
+def send_queued(day, chunk_size=CHUNK_SIZE):
+    """
+    Send the greetings still to be delivered for ``day``; returns ``(sent, failed)``.
+
+    Each chunk is claimed in a short transaction, sent over one mail connection
+    with no rows locked, and its statuses written back in one UPDATE. Failed
+    greetings are retried by later runs, up to ``MAX_ATTEMPTS`` in total.
+    """
+    sent = failed = 0
+    last_id = 0
+    while True:
+        greetings = claim_greetings(day, last_id, chunk_size)
+        if not greetings:
+            return sent, failed
+        last_id = greetings[-1].pk
+
+        now = timezone.now()
+        with get_connection() as connection:
+            for greeting in greetings:
+                message = EmailMessage(
+                    greeting.subject, greeting.message, settings.DEFAULT_FROM_EMAIL,
+                    [greeting.email], connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as e:
+                    greeting.status = 'failed'
+                    greeting.error = str(e)[:200]
+                    failed += 1
+                else:
+                    greeting.status = 'sent'
+                    greeting.error = ''
+                    greeting.sent_date = now
+                    sent += 1
+        BirthdayGreeting.objects.bulk_update(greetings, ['status', 'error', 'sent_date'])
@@ -0,0 +1,46 @@
+"""Django management command to detect likely duplicate alumni registrations.
+
+Candidate pairs are written to the duplicate review queue in the admin portal.
+Pending pairs among the checked records that no longer match are removed.
+
+Usage:
+    python manage.py find_duplicate_alumni              # full rebuild
+    python manage.py find_duplicate_alumni --incremental
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_portal.dedupe import (
+    MIN_SCORE, clear_stale_candidates, find_duplicates_full, find_duplicates_incremental, save_candidates,
+)
+
+
+class Command(BaseCommand):
+    help = "Find likely duplicate alumni records using blocking keys and fuzzy matching."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help='Only check new or edited alumni (not yet in the blocking-key index) against existing records'
+        )
+        parser.add_argument('--min-score', type=float, default=MIN_SCORE, help='Minimum score to report a pair')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if options['incremental']:
+            candidates, stats = find_duplicates_incremental(min_score=options['min_score'])
+        else:
+            candidates, stats = find_duplicates_full(min_score=options['min_score'])
+        saved = save_candidates(candidates)
+        cleared = clear_stale_candidates(candidates, stats['checked'])
+        elapsed = time.monotonic() - started
+
+        if stats['skipped_blocks']:
+            self.stdout.write(self.style.WARNING(
+                f"Skipped {stats['skipped_blocks']} oversized block(s)."
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {stats['records']} record(s) with {stats['comparisons']} comparison(s) "
+            f"in {elapsed:.1f}s; {saved} candidate pair(s) recorded, {cleared} stale pair(s) removed."
+        ))
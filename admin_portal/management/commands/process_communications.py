@@ -0,0 +1,30 @@
+"""Django management command to prepare recipients for queued communications.
+
+Communications sent to large audiences are queued by the admin portal
+instead of materializing their recipients during the request. Run this from
+cron or a worker loop.
+
+Usage:
+    python manage.py process_communications
+    python manage.py process_communications --limit 5
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_portal.communications import process_queued
+
+
+class Command(BaseCommand):
+    help = "Materialize recipients for communications queued by the admin portal."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, help='Maximum number of communications to process')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        processed = process_queued(limit=options['limit'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Prepared recipients for {processed} communication(s) in {elapsed:.1f}s."
+        ))
@@ -0,0 +1,51 @@
+"""Django management command to send today's birthday greetings.
+
+Greetings are queued once per alumnus per day, so the command can safely be
+re-run (e.g. from cron every hour): already-sent greetings are never sent
+again, and greetings that failed are retried by later runs up to
+MAX_ATTEMPTS times (see admin_portal/greetings.py).
+
+Usage:
+    python manage.py send_birthday_greetings
+    python manage.py send_birthday_greetings --date 2025-03-01 --queue-only
+"""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from admin_portal.greetings import CHUNK_SIZE, queue_greetings, send_queued
+
+
+class Command(BaseCommand):
+    help = "Queue and send birthday greetings for everyone celebrating today."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Day to process as YYYY-MM-DD (default: today)')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Greetings per batch')
+        parser.add_argument('--queue-only', action='store_true', help='Queue greetings without sending them')
+
+    def handle(self, *args, **options):
+        if options['date']:
+            try:
+                day = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['date']}")
+        else:
+            day = timezone.localdate()
+
+        started = time.monotonic()
+        queued = queue_greetings(day, chunk_size=options['chunk_size'])
+        self.stdout.write(f"Queued {queued} greeting(s) for {day:%B %d, %Y}.")
+        if options['queue_only']:
+            return
+
+        sent, failed = send_queued(day, chunk_size=options['chunk_size'])
+        elapsed = time.monotonic() - started
+        rate = sent / elapsed if elapsed else sent
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{failed} greeting(s) failed to send."))
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {sent} greeting(s) in {elapsed:.1f}s ({rate:.0f}/s)."
+        ))
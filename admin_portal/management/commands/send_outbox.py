@@ -0,0 +1,52 @@
+"""Django management command to deliver queued email and SMS messages.
+
+Drains due messages from the outbox in batches and exits. Failed messages
+are retried with exponential backoff on later runs, so run it from cron or
+in a loop (``--loop``).
+
+Usage:
+    python manage.py send_outbox
+    python manage.py send_outbox --channel email --batch-size 500
+    python manage.py send_outbox --loop --interval 30
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_portal.models import OutboxMessage
+from admin_portal.outbox import BATCH_SIZE, drain
+
+
+class Command(BaseCommand):
+    help = "Send due email and SMS messages from the delivery outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--channel', action='append', choices=[c for c, _ in OutboxMessage.CHANNEL_CHOICES],
+            help='Only send on this channel (can be repeated)'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Messages per batch/connection')
+        parser.add_argument('--max-batches', type=int, help='Stop each channel after this many batches')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for due messages')
+        parser.add_argument('--interval', type=int, default=60, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            stats = drain(options['channel'], options['batch_size'], options['max_batches'])
+            for channel, totals in stats.items():
+                if not totals['sent'] and not totals['failed']:
+                    continue
+                if totals['failed']:
+                    self.stdout.write(self.style.WARNING(
+                        f"{channel}: {totals['failed']} message(s) failed and will be retried or dead-lettered."
+                    ))
+                if totals['sent']:
+                    rate = totals['sent'] / totals['seconds'] if totals['seconds'] else totals['sent']
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{channel}: sent {totals['sent']} message(s) in {totals['seconds']:.1f}s ({rate:.1f}/s)."
+                    ))
+            if not options['loop']:
+                if not any(totals['sent'] or totals['failed'] for totals in stats.values()):
+                    self.stdout.write("No messages due.")
+                break
+            time.sleep(options['interval'])
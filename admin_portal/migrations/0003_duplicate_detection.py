@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('alumni', '0012_alumni_national_id_key'),
+        ('admin_portal', '0002_birthdaytemplate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlumniBlockingKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=128)),
+                ('alumni', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocking_keys', to='alumni.alumni')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DuplicateCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('reasons', models.CharField(blank=True, help_text='Blocking keys and fields the pair matched on', max_length=200)),
+                ('status', models.CharField(choices=[('pending', 'Pending Review'), ('confirmed', 'Confirmed Duplicate'), ('dismissed', 'Not a Duplicate')], default='pending', max_length=10)),
+                ('detected_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('reviewed_date', models.DateTimeField(blank=True, null=True)),
+                ('alumni_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='alumni.alumni')),
+                ('alumni_b', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='alumni.alumni')),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['status', '-score'], name='duplicate_status_score_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='duplicatecandidate',
+            constraint=models.UniqueConstraint(fields=('alumni_a', 'alumni_b'), name='unique_duplicate_pair'),
+        ),
+        migrations.AddIndex(
+            model_name='alumniblockingkey',
+            index=models.Index(fields=['key', 'alumni'], name='blocking_key_alumni_idx'),
+        ),
+    ]
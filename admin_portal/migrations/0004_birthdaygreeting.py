@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0016_alumni_birthday_key'),
+        ('admin_portal', '0003_duplicate_detection'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BirthdayGreeting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('birthday', models.DateField(help_text='Day the birthday was celebrated')),
+                ('email', models.EmailField(max_length=254)),
+                ('subject', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('sent', 'Sent'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('error', models.CharField(blank=True, max_length=200)),
+                ('created_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sent_date', models.DateTimeField(blank=True, null=True)),
+                ('alumni', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='birthday_greetings', to='alumni.alumni')),
+                ('template', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='admin_portal.birthdaytemplate')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['birthday', 'status'], name='birthday_greeting_status_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='birthdaygreeting',
+            constraint=models.UniqueConstraint(fields=('alumni', 'birthday'), name='unique_birthday_greeting'),
+        ),
+    ]
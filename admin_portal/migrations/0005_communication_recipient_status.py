@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:33
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_recipient_count(apps, schema_editor):
+    Communication = apps.get_model('admin_portal', 'Communication')
+    for communication in Communication.objects.annotate(total=Count('recipients')).filter(total__gt=0):
+        communication.recipient_count = communication.total
+        communication.save(update_fields=['recipient_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_portal', '0004_birthdaygreeting'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='communication',
+            name='recipient_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='communication',
+            name='recipient_status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('processing', 'Preparing Recipients'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='communication',
+            name='send_to_all',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_recipient_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('admin_portal', '0006_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AudienceSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('countries', models.JSONField(blank=True, default=list)),
+                ('graduation_year_from', models.PositiveIntegerField(blank=True, null=True)),
+                ('graduation_year_to', models.PositiveIntegerField(blank=True, null=True)),
+                ('degree_levels', models.JSONField(blank=True, default=list)),
+                ('programmes', models.JSONField(blank=True, default=list)),
+                ('employment_statuses', models.JSONField(blank=True, default=list)),
+                ('interests', models.JSONField(blank=True, default=list, help_text='Interest fields that must all be selected')),
+                ('verified_only', models.BooleanField(default=False)),
+                ('created_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='communication',
+            name='segments',
+            field=models.ManyToManyField(blank=True, related_name='communications', to='admin_portal.audiencesegment'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0017_alumni_programme_idx'),
+        ('admin_portal', '0007_audiencesegment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='communication',
+            name='bounced_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='communication',
+            name='failed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='communication',
+            name='opened_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='communication',
+            name='queued_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='communication',
+            name='sent_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='Delivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.PositiveSmallIntegerField(choices=[(0, 'Queued'), (1, 'Sent'), (2, 'Bounced'), (3, 'Failed'), (4, 'Opened')], default=0)),
+                ('alumni', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='alumni.alumni')),
+                ('communication', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='admin_portal.communication')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['communication', 'status'], name='delivery_status_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='delivery',
+            constraint=models.UniqueConstraint(fields=('communication', 'alumni'), name='unique_delivery'),
+        ),
+    ]
@@ -54,12 +54,45 @@ class BirthdayTemplate(models.Model):
         )
 
 
+class AudienceSegment(models.Model):
+    """
+    A saved audience for communications.
+
+    Every criterion that is set must match (AND); list criteria match any of
+    their values. A communication sent to several segments reaches anyone in
+    at least one of them (see admin_portal/segments.py).
+    """
+    name = models.CharField(max_length=100, unique=True)
+    countries = models.JSONField(default=list, blank=True)
+    graduation_year_from = models.PositiveIntegerField(null=True, blank=True)
+    graduation_year_to = models.PositiveIntegerField(null=True, blank=True)
+    degree_levels = models.JSONField(default=list, blank=True)
+    programmes = models.JSONField(default=list, blank=True)
+    employment_statuses = models.JSONField(default=list, blank=True)
+    interests = models.JSONField(default=list, blank=True, help_text="Interest fields that must all be selected")
+    verified_only = models.BooleanField(default=False)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
 class Communication(models.Model):
     COMMUNICATION_TYPES = [
         ('email', 'Email'),
         ('sms', 'SMS'),
         ('announcement', 'Announcement'),
     ]
+    RECIPIENT_STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('processing', 'Preparing Recipients'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
     
     title = models.CharField(max_length=200)
     message = models.TextField()
@@ -67,6 +100,172 @@ class Communication(models.Model):
     sent_date = models.DateTimeField(default=timezone.now)
     sender = models.ForeignKey(User, on_delete=models.CASCADE)
     recipients = models.ManyToManyField(Alumni, related_name='communications_received')
+    send_to_all = models.BooleanField(default=False)
+    segments = models.ManyToManyField(AudienceSegment, blank=True, related_name='communications')
+    # Recipients are materialized set-based, in the background for large audiences
+    recipient_status = models.CharField(max_length=10, choices=RECIPIENT_STATUS_CHOICES, default='ready')
+    recipient_count = models.PositiveIntegerField(default=0)
+    # Delivery summary, kept in step with Delivery rows (see admin_portal/deliveries.py)
+    queued_count = models.PositiveIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    bounced_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    opened_count = models.PositiveIntegerField(default=0)
     
     def __str__(self):
         return f"{self.title} ({self.communication_type})"
+
+    @property
+    def delivered_count(self):
+        """Deliveries that reached the recipient, whether or not they were opened."""
+        return self.sent_count + self.opened_count
+
+
+class AlumniBlockingKey(models.Model):
+    """Blocking keys used by duplicate detection; only alumni sharing a key are compared."""
+    key = models.CharField(max_length=128)
+    alumni = models.ForeignKey(Alumni, on_delete=models.CASCADE, related_name='blocking_keys')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['key', 'alumni'], name='blocking_key_alumni_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.key} -> {self.alumni_id}"
+
+
+class DuplicateCandidate(models.Model):
+    """A pair of alumni records that may belong to the same person, awaiting review."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending Review'),
+        ('confirmed', 'Confirmed Duplicate'),
+        ('dismissed', 'Not a Duplicate'),
+    ]
+
+    alumni_a = models.ForeignKey(Alumni, on_delete=models.CASCADE, related_name='+')
+    alumni_b = models.ForeignKey(Alumni, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    reasons = models.CharField(max_length=200, blank=True, help_text="Blocking keys and fields the pair matched on")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    detected_date = models.DateTimeField(default=timezone.now)
+    reviewed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    reviewed_date = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-score']
+        constraints = [
+            models.UniqueConstraint(fields=['alumni_a', 'alumni_b'], name='unique_duplicate_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['status', '-score'], name='duplicate_status_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.alumni_a_id} ~ {self.alumni_b_id} ({self.score:.2f})"
+
+
+class BirthdayGreeting(models.Model):
+    """A birthday greeting queued for one alumnus on one day; at most one per alumnus per day."""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    alumni = models.ForeignKey(Alumni, on_delete=models.CASCADE, related_name='birthday_greetings')
+    birthday = models.DateField(help_text="Day the birthday was celebrated")
+    template = models.ForeignKey(BirthdayTemplate, on_delete=models.SET_NULL, null=True, blank=True)
+    email = models.EmailField()
+    subject = models.CharField(max_length=200)
+    message = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    attempted_date = models.DateTimeField(null=True, blank=True)
+    error = models.CharField(max_length=200, blank=True)
+    created_date = models.DateTimeField(default=timezone.now)
+    sent_date = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['alumni', 'birthday'], name='unique_birthday_greeting'),
+        ]
+        indexes = [
+            models.Index(fields=['birthday', 'status'], name='birthday_greeting_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.alumni_id} {self.birthday} ({self.status})"
+
+
+class Delivery(models.Model):
+    """Delivery status of a communication for one recipient, stored as a small integer code."""
+    QUEUED = 0
+    SENT = 1
+    BOUNCED = 2
+    FAILED = 3
+    OPENED = 4
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (SENT, 'Sent'),
+        (BOUNCED, 'Bounced'),
+        (FAILED, 'Failed'),
+        (OPENED, 'Opened'),
+    ]
+
+    communication = models.ForeignKey(Communication, on_delete=models.CASCADE, related_name='deliveries')
+    alumni = models.ForeignKey(Alumni, on_delete=models.CASCADE, related_name='+')
+    status = models.PositiveSmallIntegerField(choices=STATUS_CHOICES, default=QUEUED)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['communication', 'alumni'], name='unique_delivery'),
+        ]
+        indexes = [
+            models.Index(fields=['communication', 'status'], name='delivery_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.communication_id} -> {self.alumni_id}: {self.get_status_display()}"
+
+
+class OutboxMessage(models.Model):
+    """
+    One email or SMS delivery waiting to be sent by ``manage.py send_outbox``.
+
+    Messages for a communication leave ``subject``/``body`` blank and are
+    rendered from the communication at send time.
+    """
+    CHANNEL_CHOICES = [
+        ('email', 'Email'),
+        ('sms', 'SMS'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead Letter'),
+    ]
+
+    channel = models.CharField(max_length=10, choices=CHANNEL_CHOICES)
+    address = models.CharField(max_length=254)
+    subject = models.CharField(max_length=200, blank=True)
+    body = models.TextField(blank=True)
+    communication = models.ForeignKey(Communication, on_delete=models.CASCADE, null=True, blank=True,
+                                      related_name='outbox_messages')
+    alumni = models.ForeignKey(Alumni, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_date = models.DateTimeField(default=timezone.now)
+    last_error = models.CharField(max_length=200, blank=True)
+    created_date = models.DateTimeField(default=timezone.now)
+    sent_date = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'channel', 'next_attempt_date'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} to {self.address} ({self.status})"
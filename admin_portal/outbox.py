@@ -0,0 +1,223 @@
+"""
+Email/SMS delivery outbox.
+
+Every delivery is an ``OutboxMessage`` row. ``manage.py send_outbox`` drains
+due rows in batches per channel: each batch is claimed with
+``SELECT ... FOR UPDATE SKIP LOCKED`` (so several workers can run side by
+side) and marked ``sending`` in a short transaction, then sent over a single
+backend connection outside any transaction and written back with one bulk
+UPDATE. Sends are paced to a per-channel rate limit. A failed delivery
+is retried with exponential backoff and dead-lettered after
+``MAX_ATTEMPTS`` tries. Final outcomes of communication messages are
+copied onto their ``Delivery`` status rows.
+"""
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.core.mail import get_connection as get_mail_connection
+from django.db import transaction
+from django.utils import timezone
+
+from . import deliveries, sms
+from .models import Communication, Delivery, OutboxMessage
+
+BATCH_SIZE = 200
+ENQUEUE_CHUNK_SIZE = 2000
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 60  # seconds before the first retry, doubled for each further attempt
+BACKOFF_MAX = 6 * 60 * 60
+# How long a claimed batch stays reserved beyond its expected send time
+CLAIM_LEASE = timedelta(minutes=10)
+
+# Messages per second; override with settings.OUTBOX_RATE_LIMITS
+DEFAULT_RATE_LIMITS = {'email': 20, 'sms': 5}
+
+# communication_type -> (outbox channel, Alumni field holding the address)
+CHANNELS = {
+    'email': ('email', 'email'),
+    'sms': ('sms', 'mobile_number'),
+}
+
+
+def rate_limits():
+    return {**DEFAULT_RATE_LIMITS, **getattr(settings, 'OUTBOX_RATE_LIMITS', {})}
+
+
+def backoff(attempts):
+    """Delay before retrying a message that has failed ``attempts`` times."""
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX))
+
+
+def enqueue_communication(communication, chunk_size=ENQUEUE_CHUNK_SIZE):
+    """
+    Queue one delivery per recipient of a communication; returns the number queued.
+
+    Recipients without an address for the channel are recorded as failed.
+    """
+    if communication.communication_type not in CHANNELS:
+        return 0
+    channel, field = CHANNELS[communication.communication_type]
+    recipients = communication.recipients.values_list('pk', field).order_by('pk').iterator(chunk_size=chunk_size)
+    statuses = []
+    queued = 0
+    batch = []
+    for pk, address in recipients:
+        if not address:
+            statuses.append((pk, Delivery.FAILED))
+            continue
+        statuses.append((pk, Delivery.QUEUED))
+        batch.append(OutboxMessage(channel=channel, address=address, communication=communication, alumni_id=pk))
+        if len(batch) >= chunk_size:
+            OutboxMessage.objects.bulk_create(batch)
+            queued += len(batch)
+            batch = []
+    if batch:
+        OutboxMessage.objects.bulk_create(batch)
+        queued += len(batch)
+    deliveries.create_deliveries(communication, statuses)
+    return queued
+
+
+class RateLimiter:
+    """Space out calls so they don't exceed ``per_second``."""
+    def __init__(self, per_second):
+        self.interval = 1 / per_second if per_second else 0
+        self.next_at = time.monotonic()
+
+    def wait(self):
+        now = time.monotonic()
+        if self.next_at > now:
+            time.sleep(self.next_at - now)
+        self.next_at = max(now, self.next_at) + self.interval
+
+
+def _content(message, communications):
+    if message.communication_id:
+        communication = communications[message.communication_id]
+        return communication.title, communication.message
+    return message.subject, message.body
+
+
+def _build(message, communications, connection):
+    subject, body = _content(message, communications)
+    if message.channel == 'email':
+        return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [message.address], connection=connection)
+    return sms.SMSMessage(message.address, body)
+
+
+def _failed(message, error, now):
+    message.attempts += 1
+    message.last_error = str(error)[:200]
+    if message.attempts >= MAX_ATTEMPTS:
+        message.status = 'dead'
+    else:
+        message.status = 'pending'
+        message.next_attempt_date = now + backoff(message.attempts)
+
+
+def claim_batch(channel, batch_size=BATCH_SIZE, lease=CLAIM_LEASE):
+    """
+    Claim up to ``batch_size`` due messages on a channel and commit the claim.
+
+    Claimed rows are marked ``sending`` with ``next_attempt_date`` pushed out
+    by ``lease``; if the worker dies before writing back, the lease expires
+    and the rows are claimed again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxMessage.objects
+            .select_for_update(skip_locked=True)
+            .filter(status__in=['pending', 'sending'], channel=channel, next_attempt_date__lte=now)
+            .order_by('next_attempt_date', 'pk')[:batch_size]
+        )
+        if batch:
+            OutboxMessage.objects.filter(pk__in=[m.pk for m in batch]).update(
+                status='sending', next_attempt_date=now + lease,
+            )
+    return batch
+
+
+def send_batch(channel, limiter, batch_size=BATCH_SIZE):
+    """
+    Send one batch of due messages on a channel.
+
+    The batch is claimed in a short transaction; sending and rate-limit waits
+    happen outside it, so no row locks or open transaction are held meanwhile.
+    Returns ``(sent, failed)``, or None when nothing is due.
+    """
+    lease = timedelta(seconds=batch_size * limiter.interval) + CLAIM_LEASE
+    batch = claim_batch(channel, batch_size, lease)
+    if not batch:
+        return None
+    now = timezone.now()
+    communication_ids = {m.communication_id for m in batch if m.communication_id}
+    communications = Communication.objects.in_bulk(communication_ids)
+
+    sent = failed = 0
+    connection = get_mail_connection() if channel == 'email' else sms.get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        for message in batch:
+            _failed(message, e, now)
+        failed = len(batch)
+    else:
+        try:
+            for message in batch:
+                limiter.wait()
+                try:
+                    if not connection.send_messages([_build(message, communications, connection)]):
+                        raise RuntimeError("Backend did not accept the message")
+                except Exception as e:
+                    _failed(message, e, now)
+                    failed += 1
+                else:
+                    message.status = 'sent'
+                    message.attempts += 1
+                    message.sent_date = timezone.now()
+                    sent += 1
+        finally:
+            connection.close()
+
+    with transaction.atomic():
+        OutboxMessage.objects.bulk_update(
+            batch, ['status', 'attempts', 'next_attempt_date', 'last_error', 'sent_date']
+        )
+
+        # Mirror final outcomes onto the per-recipient delivery status
+        outcomes = {'sent': defaultdict(list), 'dead': defaultdict(list)}
+        for message in batch:
+            if message.communication_id and message.alumni_id and message.status in outcomes:
+                outcomes[message.status][message.communication_id].append(message.alumni_id)
+        deliveries.transition_many(outcomes['sent'], Delivery.SENT)
+        deliveries.transition_many(outcomes['dead'], Delivery.FAILED)
+    return sent, failed
+
+
+def drain(channels=None, batch_size=BATCH_SIZE, max_batches=None):
+    """
+    Send due messages until none are left (or ``max_batches`` per channel).
+
+    Returns ``{channel: {'sent': n, 'failed': n, 'seconds': s}}``.
+    """
+    limits = rate_limits()
+    stats = {}
+    for channel in channels or [choice for choice, _ in OutboxMessage.CHANNEL_CHOICES]:
+        limiter = RateLimiter(limits.get(channel))
+        totals = {'sent': 0, 'failed': 0}
+        started = time.monotonic()
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            result = send_batch(channel, limiter, batch_size)
+            if result is None:
+                break
+            totals['sent'] += result[0]
+            totals['failed'] += result[1]
+            batches += 1
+        totals['seconds'] = time.monotonic() - started
+        stats[channel] = totals
+    return stats
@@ -0,0 +1,127 @@
+"""
+Keyset (cursor) pagination helpers for the admin portal.
+
+Offset pagination gets slower the deeper you page because the database still
+has to walk every skipped row. Keyset pagination instead remembers the sort
+key of the last row shown and asks for rows strictly after it, which an index
+on ``(sort_field, id)`` answers directly no matter how deep the page is.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+def encode_cursor(values):
+    """Encode a list of sort-key values into an opaque URL-safe token."""
+    raw = json.dumps(values, default=str, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a token produced by :func:`encode_cursor`; returns None if invalid."""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+class KeysetPage:
+    """A single page of results plus the cursors needed to move around."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by ``(sort_field, pk)`` without OFFSET.
+
+    Args:
+        queryset: The (already filtered) queryset to paginate
+        sort_field: Model field name to order by
+        descending: Whether the primary sort is descending
+        per_page: Number of rows per page
+    """
+
+    def __init__(self, queryset, sort_field, descending=True, per_page=50):
+        self.queryset = queryset
+        self.sort_field = sort_field
+        self.descending = descending
+        self.per_page = per_page
+        self.model_field = queryset.model._meta.get_field(sort_field)
+
+    def _ordering(self, reverse=False):
+        descending = self.descending != reverse
+        prefix = '-' if descending else ''
+        return [f'{prefix}{self.sort_field}', f'{prefix}pk']
+
+    def _seek(self, values, reverse=False):
+        """Build the 'rows after this key' predicate for the given direction."""
+        try:
+            value = self.model_field.to_python(values[0])
+            pk = int(values[1])
+        except (ValidationError, IndexError, TypeError, ValueError):
+            return None
+        descending = self.descending != reverse
+        op = 'lt' if descending else 'gt'
+        return (
+            Q(**{f'{self.sort_field}__{op}': value})
+            | Q(**{self.sort_field: value, f'pk__{op}': pk})
+        )
+
+    def _key(self, obj):
+        return encode_cursor([getattr(obj, self.sort_field), obj.pk])
+
+    def page(self, after=None, before=None):
+        """
+        Return the page following ``after`` or preceding ``before``.
+
+        Both arguments are cursor tokens; when neither is given the first page
+        is returned. Each call issues exactly one query.
+        """
+        backwards = bool(before) and not after
+        qs = self.queryset.order_by(*self._ordering(reverse=backwards))
+
+        cursor = decode_cursor(before if backwards else after)
+        seek = self._seek(cursor, reverse=backwards) if cursor else None
+        if seek is not None:
+            qs = qs.filter(seek)
+
+        rows = list(qs[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if not rows:
+            return KeysetPage([])
+
+        if backwards:
+            next_cursor = self._key(rows[-1])
+            previous_cursor = self._key(rows[0]) if has_more else None
+        else:
+            next_cursor = self._key(rows[-1]) if has_more else None
+            previous_cursor = self._key(rows[0]) if seek is not None else None
+        return KeysetPage(rows, next_cursor=next_cursor, previous_cursor=previous_cursor)
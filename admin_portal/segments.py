@@ -0,0 +1,56 @@
+"""
+Compile audience segments to a single predicate on Alumni.
+
+Each segment becomes an AND of conditions on indexed columns (country,
+graduation year, degree level, programme, employment status, verification,
+interest mask), and several segments are OR-ed together. Counting or
+materializing an audience is one query over that predicate, so a targeted
+mailing only touches the matching rows.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from alumni.interests import masks_with_all
+from alumni.models import Alumni
+
+
+def segment_q(segment):
+    """Return the Q for one segment; an empty segment matches everyone."""
+    q = Q()
+    if segment.countries:
+        q &= Q(country__in=segment.countries)
+    if segment.graduation_year_from:
+        q &= Q(graduation_year__gte=segment.graduation_year_from)
+    if segment.graduation_year_to:
+        q &= Q(graduation_year__lte=segment.graduation_year_to)
+    if segment.degree_levels:
+        q &= Q(degree_level__in=segment.degree_levels)
+    if segment.programmes:
+        q &= Q(programme_studied__in=segment.programmes)
+    if segment.employment_statuses:
+        q &= Q(employment_status__in=segment.employment_statuses)
+    if segment.interests:
+        q &= Q(interest_mask__in=masks_with_all(*segment.interests))
+    if segment.verified_only:
+        q &= Q(is_verified=True)
+    return q
+
+
+def audience_q(segments):
+    """Return the Q matching anyone in at least one of ``segments``, or None if there are none."""
+    segments = list(segments)
+    if not segments:
+        return None
+    return reduce(or_, (segment_q(segment) for segment in segments))
+
+
+def audience(segments, send_to_all=False):
+    """Return the Alumni queryset for a combination of segments."""
+    if send_to_all:
+        return Alumni.objects.all()
+    q = audience_q(segments)
+    if q is None:
+        return Alumni.objects.none()
+    return Alumni.objects.filter(q)
@@ -0,0 +1,19 @@
+"""
+Signal handlers for the admin portal.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from alumni.models import Alumni
+from .dedupe import KEY_FIELDS
+from .models import AlumniBlockingKey
+
+@receiver(post_save, sender=Alumni)
+def alumni_blocking_keys_post_save(sender, instance, created, update_fields=None, **kwargs):
+    """Drop the blocking keys of an edited record so the next incremental run re-keys and re-checks it."""
+    if created:
+        return
+    # Saves of loaded records only write the changed columns (see Alumni.save)
+    if update_fields is not None and not KEY_FIELDS & set(update_fields):
+        return
+    AlumniBlockingKey.objects.filter(alumni=instance).delete()
@@ -0,0 +1,71 @@
+"""
+Pluggable SMS backends, modelled on Django's email backends.
+
+``settings.SMS_BACKEND`` names the backend class. A backend is opened once
+per batch and its ``send_messages`` returns the number of messages sent,
+raising on failure. The console and locmem backends need no gateway and are
+meant for development and testing.
+"""
+import sys
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Messages sent through the locmem backend, like django.core.mail.outbox
+outbox = []
+
+
+class SMSMessage:
+    def __init__(self, to, body):
+        self.to = to
+        self.body = body
+
+    def __repr__(self):
+        return f"SMSMessage(to={self.to!r})"
+
+
+class BaseSMSBackend:
+    def __init__(self, fail_silently=False, **kwargs):
+        self.fail_silently = fail_silently
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def send_messages(self, messages):
+        raise NotImplementedError
+
+
+class ConsoleBackend(BaseSMSBackend):
+    """Write messages to stdout."""
+    _lock = threading.Lock()
+
+    def send_messages(self, messages):
+        with self._lock:
+            for message in messages:
+                sys.stdout.write(f"SMS to {message.to}: {message.body}\n")
+            sys.stdout.flush()
+        return len(messages)
+
+
+class LocmemBackend(BaseSMSBackend):
+    """Keep messages in ``admin_portal.sms.outbox``."""
+    def send_messages(self, messages):
+        outbox.extend(messages)
+        return len(messages)
+
+
+def get_connection(backend=None, **kwargs):
+    """Return an instance of the configured SMS backend."""
+    klass = import_string(backend or getattr(settings, 'SMS_BACKEND', 'admin_portal.sms.ConsoleBackend'))
+    return klass(**kwargs)
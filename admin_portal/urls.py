@@ -10,8 +10,12 @@ urlpatterns = [
     path('logout/', AdminLogoutView.as_view(), name='logout'),
     path('', views.DashboardView.as_view(), name='dashboard'),
     path('alumni/', views.AlumniListView.as_view(), name='alumni_list'),
+    path('alumni/export/', views.AlumniExportView.as_view(), name='alumni_export'),
     path('alumni/<int:pk>/', views.AlumniDetailView.as_view(), name='alumni_detail'),
     path('alumni/<int:pk>/verify/', views.VerifyAlumniView.as_view(), name='verify_alumni'),
+    path('audit-log/', views.AuditLogView.as_view(), name='audit_log'),
+    path('duplicates/', views.DuplicateListView.as_view(), name='duplicates'),
+    path('duplicates/<int:pk>/review/', views.ReviewDuplicateView.as_view(), name='review_duplicate'),
     path('newsletters/', views.NewsletterListView.as_view(), name='newsletters'),
     path('newsletters/create/', views.CreateNewsletterView.as_view(), name='create_newsletter'),
     path('newsletters/<int:pk>/edit/', views.EditNewsletterView.as_view(), name='edit_newsletter'),
@@ -19,7 +23,12 @@ urlpatterns = [
     path('events/create/', views.CreateEventView.as_view(), name='create_event'),
     path('events/<int:pk>/edit/', views.EditEventView.as_view(), name='edit_event'),
     path('communication/', views.CommunicationView.as_view(), name='communication'),
+    path('communication/recipient-count/', views.RecipientCountView.as_view(), name='recipient_count'),
+    path('segments/', views.SegmentListView.as_view(), name='segments'),
+    path('segments/<int:pk>/edit/', views.EditSegmentView.as_view(), name='edit_segment'),
     path('reports/', views.ReportsView.as_view(), name='reports'),
+    path('reports/interests.json', views.InterestReportView.as_view(), name='interest_report'),
+    path('reports/registrations/', views.RegistrationAnalyticsView.as_view(), name='registration_analytics'),
     path('birthdays/', views.BirthdayListView.as_view(), name='birthdays'),
     path('birthday-templates/', views.BirthdayTemplateListView.as_view(), name='birthday_templates'),
     path('birthday-templates/create/', views.CreateBirthdayTemplateView.as_view(), name='create_birthday_template'),
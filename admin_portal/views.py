@@ -1,3 +1,6 @@
+import csv
+from datetime import timedelta
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views import View
 from django.contrib.auth.views import LoginView, LogoutView
@@ -5,12 +8,21 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.contrib import messages
-from django.db.models import Count
-from .forms import AdminLoginForm, NewsletterForm, EventForm, CommunicationForm, BirthdayTemplateForm
-from alumni.models import Alumni, Newsletter, Event
-from .models import Communication, BirthdayTemplate
+from django.db.models import Count, F, Func, Q, Subquery
+from .forms import (
+    AdminLoginForm, NewsletterForm, EventForm, CommunicationForm, BirthdayTemplateForm, AlumniFilterForm,
+    RegistrationAnalyticsForm, AudienceSegmentForm, AuditLogFilterForm,
+)
+from .pagination import KeysetPage, KeysetPaginator
+from alumni import cache, interests, rollups, rsvp
+from alumni.birthdays import birthdays_between, next_birthday
+from alumni.search import filter_matches, search_alumni
+from alumni.models import Alumni, AuditLog, Newsletter, Event
+from .models import AudienceSegment, Communication, BirthdayTemplate, DuplicateCandidate
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from . import communications, exports, segments
 
 
 class AdminLogoutView(LogoutView):
@@ -25,31 +37,142 @@ class AdminLoginView(LoginView):
     success_url = reverse_lazy('admin_portal:dashboard')
 
 
+def _count(model):
+    """Scalar subquery counting every row of ``model``."""
+    return Subquery(model.objects.order_by().annotate(n=Func(F('pk'), function='COUNT')).values('n'))
+
+
+def dashboard_counts():
+    """Alumni, verified, newsletter and event counts from a single query."""
+    # Uncorrelated subqueries add no GROUP BY, so this always yields exactly one row
+    return (
+        Alumni.objects.order_by()
+        .values(newsletter_count=_count(Newsletter), event_count=_count(Event))
+        .annotate(alumni_count=Count('pk'), verified_alumni_count=Count('pk', filter=Q(is_verified=True)))
+        .get()
+    )
+
+
 @method_decorator(login_required, name='dispatch')
 class DashboardView(View):
+    recent_fields = ('id', 'first_name', 'last_name', 'reg_number', 'programme_studied',
+                     'registration_date', 'is_verified')
+
     def get(self, request):
-        alumni_count = Alumni.objects.count()
-        verified_alumni_count = Alumni.objects.filter(is_verified=True).count()
-        recent_alumni = Alumni.objects.order_by('-registration_date')[:5]
-        newsletter_count = Newsletter.objects.count()
-        event_count = Event.objects.count()
-        
-        context = {
-            'alumni_count': alumni_count,
-            'verified_alumni_count': verified_alumni_count,
-            'recent_alumni': recent_alumni,
-            'newsletter_count': newsletter_count,
-            'event_count': event_count,
-        }
+        context = dict(cache.get_or_compute(cache.DASHBOARD, 'counts', dashboard_counts))
+        context['recent_alumni'] = Alumni.objects.only(*self.recent_fields).order_by('-registration_date')[:5]
         
         return render(request, 'admin_portal/dashboard.html', context)
 
 
 @method_decorator(login_required, name='dispatch')
 class AlumniListView(View):
+    """Filterable alumni list, keyset-paginated so deep pages stay as cheap as the first."""
+    paginate_by = 50
+    list_fields = (
+        'id', 'first_name', 'last_name', 'reg_number', 'programme_studied',
+        'email', 'graduation_year', 'registration_date', 'is_verified',
+    )
+
     def get(self, request):
-        alumni = Alumni.objects.all().order_by('-registration_date')
-        return render(request, 'admin_portal/alumni_list.html', {'alumni': alumni})
+        filter_form = AlumniFilterForm(request.GET or None)
+        queryset = filter_form.filter_queryset(Alumni.objects.only(*self.list_fields))
+        sort_field, descending = filter_form.get_sort()
+
+        search = filter_form.get_search()
+        if search:
+            # Ranked results: show the best matches rather than paging by sort key
+            page = KeysetPage(search_alumni(search, queryset=queryset, limit=self.paginate_by))
+        else:
+            paginator = KeysetPaginator(queryset, sort_field, descending=descending, per_page=self.paginate_by)
+            page = paginator.page(after=request.GET.get('after'), before=request.GET.get('before'))
+
+        # Keep the current filters when following next/previous links
+        query = request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        sort_query = query.copy()
+        sort_query.pop('sort', None)
+
+        context = {
+            'alumni': page,
+            'page': page,
+            'filter_form': filter_form,
+            'querystring': query.urlencode(),
+            'sort_querystring': sort_query.urlencode(),
+            'current_sort': f"{'-' if descending else ''}{sort_field}",
+            'search': search,
+        }
+        return render(request, 'admin_portal/alumni_list.html', context)
+
+
+@method_decorator(login_required, name='dispatch')
+class AlumniExportView(View):
+    """Stream the filtered alumni list as CSV or JSON Lines, optionally gzipped."""
+    formats = {
+        'csv': ('text/csv', exports.iter_csv),
+        'jsonl': ('application/x-ndjson', exports.iter_jsonl),
+    }
+
+    def get(self, request):
+        filter_form = AlumniFilterForm(request.GET or None)
+        queryset = filter_form.filter_queryset(Alumni.objects.all())
+        search = filter_form.get_search()
+        if search:
+            # Every match of the list's search, filtered in SQL and streamed like any other export
+            queryset = filter_matches(queryset, search)
+
+        fmt = request.GET.get('format', 'csv')
+        if fmt not in self.formats:
+            fmt = 'csv'
+        content_type, encoder = self.formats[fmt]
+        stream = encoder(exports.iter_rows(queryset))
+
+        filename = f"alumni-{timezone.localdate():%Y%m%d}.{fmt}"
+        if request.GET.get('gzip'):
+            stream = exports.gzip_stream(stream)
+            content_type = 'application/gzip'
+            filename += '.gz'
+
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+@method_decorator(login_required, name='dispatch')
+class AuditLogView(View):
+    """Audit trail browser for data-protection requests, keyset-paginated newest first."""
+    paginate_by = 50
+    list_fields = (
+        'id', 'alumni_id', 'action', 'timestamp', 'ip_address', 'changed_fields', 'reason',
+        'alumni__first_name', 'alumni__last_name', 'alumni__reg_number',
+    )
+    export_fields = ('id', 'alumni_id', 'action', 'timestamp', 'ip_address', 'user_agent', 'changed_fields', 'reason')
+
+    def get(self, request):
+        filter_form = AuditLogFilterForm(request.GET or None)
+        queryset = filter_form.filter_queryset(AuditLog.objects.all())
+
+        if request.GET.get('format') == 'jsonl':
+            stream = exports.iter_jsonl(exports.iter_rows(queryset, self.export_fields), self.export_fields)
+            response = StreamingHttpResponse(stream, content_type='application/x-ndjson')
+            response['Content-Disposition'] = f'attachment; filename="audit-log-{timezone.localdate():%Y%m%d}.jsonl"'
+            return response
+
+        queryset = queryset.select_related('alumni').only(*self.list_fields)
+        paginator = KeysetPaginator(queryset, 'timestamp', descending=True, per_page=self.paginate_by)
+        page = paginator.page(after=request.GET.get('after'), before=request.GET.get('before'))
+
+        query = request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        context = {
+            'logs': page,
+            'page': page,
+            'filter_form': filter_form,
+            'querystring': query.urlencode(),
+        }
+        return render(request, 'admin_portal/audit_log.html', context)
 
 
 @method_decorator(login_required, name='dispatch')
@@ -70,6 +193,47 @@ class VerifyAlumniView(View):
         return redirect('admin_portal:alumni_detail', pk=pk)
 
 
+@method_decorator(login_required, name='dispatch')
+class DuplicateListView(View):
+    """Review queue of likely duplicate alumni, highest scores first."""
+    limit = 100
+    alumni_fields = ('first_name', 'last_name', 'email', 'graduation_year', 'mobile_number', 'registration_date')
+
+    def get(self, request):
+        status = request.GET.get('status', 'pending')
+        if status not in dict(DuplicateCandidate.STATUS_CHOICES):
+            status = 'pending'
+        related = [f'alumni_{side}__{field}' for side in 'ab' for field in self.alumni_fields]
+        candidates = (
+            DuplicateCandidate.objects
+            .filter(status=status)
+            .select_related('alumni_a', 'alumni_b')
+            .only('score', 'reasons', 'status', 'detected_date', 'alumni_a', 'alumni_b', *related)
+            .order_by('-score')[:self.limit]
+        )
+        context = {
+            'candidates': candidates,
+            'status': status,
+            'status_choices': DuplicateCandidate.STATUS_CHOICES,
+        }
+        return render(request, 'admin_portal/duplicate_list.html', context)
+
+
+@method_decorator(login_required, name='dispatch')
+class ReviewDuplicateView(View):
+    """Mark a duplicate candidate as confirmed or dismissed."""
+    def post(self, request, pk):
+        candidate = get_object_or_404(DuplicateCandidate, pk=pk)
+        status = request.POST.get('status')
+        if status in dict(DuplicateCandidate.STATUS_CHOICES):
+            candidate.status = status
+            candidate.reviewed_by = request.user
+            candidate.reviewed_date = timezone.now()
+            candidate.save(update_fields=['status', 'reviewed_by', 'reviewed_date'])
+            messages.success(request, f"Pair marked as {candidate.get_status_display().lower()}.")
+        return redirect('admin_portal:duplicates')
+
+
 @method_decorator(login_required, name='dispatch')
 class NewsletterListView(View):
     def get(self, request):
@@ -123,45 +287,30 @@ class EventListView(View):
 @method_decorator(login_required, name='dispatch')
 class BirthdayListView(View):
     """List alumni with birthdays today and upcoming birthdays within next 30 days."""
+    upcoming_days = 30
+    display_fields = ('id', 'first_name', 'last_name', 'email', 'date_of_birth', 'birthday_key')
+
     def get(self, request):
-        from datetime import timedelta
         today = timezone.localdate()
-        upcoming_limit = today + timedelta(days=30)
-
-        today_birthdays = []
-        upcoming_birthdays = []
+        upcoming_limit = today + timedelta(days=self.upcoming_days)
 
         # Get birthday templates for better display
         birthday_templates = {}
         for template in BirthdayTemplate.objects.filter(is_active=True):
             birthday_templates[template.month] = template
 
-        alumni_qs = Alumni.objects.filter(date_of_birth__isnull=False)
+        # Only the matching rows are fetched, via the birthday_key index
+        alumni_qs = birthdays_between(Alumni.objects.only(*self.display_fields), today, upcoming_limit)
+        today_birthdays = []
+        upcoming_birthdays = []
         for alum in alumni_qs:
-            dob = alum.date_of_birth
-            if not dob:
-                continue
-            try:
-                next_bd = dob.replace(year=today.year)
-            except ValueError:
-                # handle Feb 29 on non-leap year -> move to Mar 1
-                next_bd = dob.replace(year=today.year, day=1, month=3)
-            if next_bd < today:
-                # birthday already occurred this year; use next year
-                try:
-                    next_bd = dob.replace(year=today.year + 1)
-                except ValueError:
-                    next_bd = dob.replace(year=today.year + 1, day=1, month=3)
-
+            next_bd = next_birthday(alum.date_of_birth, today)
             # Attach template info for this alumni's birthday month
-            template = birthday_templates.get(next_bd.month)
-            setattr(alum, 'birthday_template', template)
-
+            alum.birthday_template = birthday_templates.get(next_bd.month)
             if next_bd == today:
                 today_birthdays.append(alum)
-            elif today < next_bd <= upcoming_limit:
-                # attach attribute for template use
-                setattr(alum, 'next_birthday', next_bd)
+            else:
+                alum.next_birthday = next_bd
                 upcoming_birthdays.append(alum)
 
         upcoming_birthdays.sort(key=lambda x: x.next_birthday)
@@ -200,8 +349,12 @@ class EditEventView(View):
         event = get_object_or_404(Event, pk=pk)
         form = EventForm(request.POST, request.FILES, instance=event)
         if form.is_valid():
-            form.save()
+            event = form.save()
+            # Raising the capacity frees places for the waitlist
+            promoted = rsvp.promote_waitlist(event.pk)
             messages.success(request, "Event updated successfully!")
+            if promoted:
+                messages.info(request, f"{len(promoted)} waitlisted registration(s) confirmed.")
             return redirect('admin_portal:events')
         return render(request, 'admin_portal/edit_event.html', {'form': form, 'event': event})
 
@@ -211,53 +364,163 @@ class ReportsView(View):
     """Display aggregated alumni reports by country and areas of interest."""
     @method_decorator(login_required)
     def get(self, request):
-        # Alumni by country
-        country_counts = Alumni.objects.values('country').annotate(total=Count('id')).order_by('-total')
-
-        # Alumni by areas of interest (boolean fields)
-        interest_mapping = {
-            'Networking/Peer Engagement': 'interest_networking',
-            'Academic & Mentorship': 'interest_academic',
-            'Career & Professional Development': 'interest_career',
-            'Giving Back': 'interest_giving_back',
-            'Stay Informed': 'interest_stay_informed',
-        }
-        interest_counts = {
-            label: Alumni.objects.filter(**{field: True}).count()
-            for label, field in interest_mapping.items()
-        }
+        # All counts come from the rollup tables: O(groups), not O(alumni)
+        country_counts = [
+            {'country': value, 'total': total} for value, total in rollups.rollup_counts('country')
+        ]
+        interest_report = interests.interest_report(histogram=rollups.interest_histogram())
+
+        degree_labels = dict(Alumni.DEGREE_LEVELS)
+        employment_labels = dict(Alumni.EMPLOYMENT_STATUS_CHOICES)
+        breakdowns = [
+            ('Alumni by Graduation Year', sorted(rollups.rollup_counts('graduation_year'), reverse=True)),
+            ('Alumni by Degree Level', [
+                (degree_labels.get(value, value), total) for value, total in rollups.rollup_counts('degree_level')
+            ]),
+            ('Alumni by Employment Status', [
+                (employment_labels.get(value, value), total) for value, total in rollups.rollup_counts('employment_status')
+            ]),
+        ]
 
         context = {
             'country_counts': country_counts,
-            'interest_counts': interest_counts,
+            'interest_counts': interest_report['counts'],
+            'interest_co_occurrence': interest_report['co_occurrence'],
+            'breakdowns': breakdowns,
+            'registration_form': RegistrationAnalyticsForm(),
         }
         return render(request, 'admin_portal/reports.html', context)
 
 
+@method_decorator(login_required, name='dispatch')
+class InterestReportView(View):
+    """JSON interest counts and co-occurrence, optionally restricted by the alumni list filters."""
+    def get(self, request):
+        filter_form = AlumniFilterForm(request.GET or None)
+        report = interests.interest_report(filter_form.filter_queryset(Alumni.objects.all()))
+        report['co_occurrence'] = [
+            {'interests': [a, b], 'total': total} for a, b, total in report['co_occurrence']
+        ]
+        return JsonResponse(report)
+
+
+@method_decorator(login_required, name='dispatch')
+class RegistrationAnalyticsView(View):
+    """Registrations over time, summed from the daily buckets, as JSON or CSV."""
+    group_columns = {
+        'none': [],
+        'graduation_year': ['graduation_year'],
+        'programme': ['programme'],
+        'cohort': ['graduation_year', 'programme'],
+    }
+
+    def get(self, request):
+        form = RegistrationAnalyticsForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+        options = form.cleaned_data
+        series = rollups.registration_series(
+            options['start'], options['end'], options['interval'], options['group_by']
+        )
+        columns = ['period'] + self.group_columns[options['group_by']] + ['registrations']
+        rows = [[period.isoformat(), *group, total] for period, group, total in series]
+
+        if request.GET.get('format') == 'csv':
+            response = HttpResponse(content_type='text/csv')
+            response['Content-Disposition'] = (
+                f'attachment; filename="registrations-{options["interval"]}-{timezone.localdate():%Y%m%d}.csv"'
+            )
+            writer = csv.writer(response)
+            writer.writerow(columns)
+            writer.writerows(rows)
+            return response
+
+        return JsonResponse({
+            'interval': options['interval'],
+            'group_by': options['group_by'],
+            'start': options['start'].isoformat() if options['start'] else None,
+            'end': options['end'].isoformat() if options['end'] else None,
+            'total': sum(row[-1] for row in rows),
+            'series': [dict(zip(columns, row)) for row in rows],
+        })
+
+
+@method_decorator(login_required, name='dispatch')
 class CommunicationView(View):
     def get(self, request):
         form = CommunicationForm()
-        communications = Communication.objects.all().order_by('-sent_date')
-        return render(request, 'admin_portal/communication.html', {'form': form, 'communications': communications})
+        history = Communication.objects.select_related('sender').order_by('-sent_date')
+        return render(request, 'admin_portal/communication.html', {'form': form, 'communications': history})
     
     def post(self, request):
         form = CommunicationForm(request.POST)
         if form.is_valid():
             comm = form.save(commit=False)
             comm.sender = request.user
+            comm.send_to_all = form.cleaned_data['all_alumni']
             comm.save()
+            form.save_m2m()
             
             # Handle recipients
-            if form.cleaned_data['all_alumni']:
-                alumni = Alumni.objects.all()
-                for alum in alumni:
-                    comm.recipients.add(alum)
-            
-            messages.success(request, "Communication sent successfully!")
+            has_audience = comm.send_to_all or form.cleaned_data['segments']
+            if has_audience and not communications.schedule_recipients(comm):
+                messages.success(request, "Communication saved. Recipients are being prepared in the background.")
+            else:
+                messages.success(request, "Communication sent successfully!")
             return redirect('admin_portal:communication')
         
-        communications = Communication.objects.all().order_by('-sent_date')
-        return render(request, 'admin_portal/communication.html', {'form': form, 'communications': communications})
+        history = Communication.objects.select_related('sender').order_by('-sent_date')
+        return render(request, 'admin_portal/communication.html', {'form': form, 'communications': history})
+
+
+@method_decorator(login_required, name='dispatch')
+class RecipientCountView(View):
+    """Live recipient count for the audience selected on the communication form."""
+    def get(self, request):
+        send_to_all = request.GET.get('all_alumni') in ('on', 'true', '1')
+        segment_ids = [pk for pk in request.GET.getlist('segments') if pk.isdigit()]
+        audience = segments.audience(AudienceSegment.objects.filter(pk__in=segment_ids), send_to_all=send_to_all)
+        return JsonResponse({'count': audience.count()})
+
+
+@method_decorator(login_required, name='dispatch')
+class SegmentListView(View):
+    """List saved audience segments and create new ones."""
+    def get(self, request):
+        return self.render_page(request, AudienceSegmentForm())
+
+    def post(self, request):
+        form = AudienceSegmentForm(request.POST)
+        if form.is_valid():
+            segment = form.save(commit=False)
+            segment.created_by = request.user
+            segment.save()
+            messages.success(request, f"Segment '{segment.name}' created successfully!")
+            return redirect('admin_portal:segments')
+        return self.render_page(request, form)
+
+    def render_page(self, request, form):
+        segment_list = list(AudienceSegment.objects.all())
+        for segment in segment_list:
+            segment.recipient_count = segments.audience([segment]).count()
+        return render(request, 'admin_portal/segment_list.html', {'form': form, 'segments': segment_list})
+
+
+@method_decorator(login_required, name='dispatch')
+class EditSegmentView(View):
+    def get(self, request, pk):
+        segment = get_object_or_404(AudienceSegment, pk=pk)
+        form = AudienceSegmentForm(instance=segment)
+        return render(request, 'admin_portal/edit_segment.html', {'form': form, 'segment': segment})
+
+    def post(self, request, pk):
+        segment = get_object_or_404(AudienceSegment, pk=pk)
+        form = AudienceSegmentForm(request.POST, instance=segment)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Segment updated successfully!")
+            return redirect('admin_portal:segments')
+        return render(request, 'admin_portal/edit_segment.html', {'form': form, 'segment': segment})
 
 
 @method_decorator(login_required, name='dispatch')
@@ -1,5 +1,9 @@
 from django.contrib import admin
+from django.db.models import Q
+from django.utils import timezone
+from .birthdays import birthdays_on
 from .models import AlumniStory, SocialLink, Donation, Alumni
+from .search import search_alumni
 
 
 @admin.register(AlumniStory)
@@ -37,8 +41,7 @@ class BirthdayTodayFilter(admin.SimpleListFilter):
 
     def queryset(self, request, queryset):
         if self.value() == 'yes':
-            today = timezone.localdate()
-            return queryset.filter(date_of_birth__month=today.month, date_of_birth__day=today.day)
+            return birthdays_on(queryset, timezone.localdate())
         return queryset
 
 
@@ -52,7 +55,8 @@ class BirthMonthFilter(admin.SimpleListFilter):
 
     def queryset(self, request, queryset):
         if self.value():
-            return queryset.filter(date_of_birth__month=int(self.value()))
+            month = int(self.value())
+            return queryset.filter(birthday_key__gte=month * 100, birthday_key__lt=(month + 1) * 100)
         return queryset
 
 
@@ -62,6 +66,19 @@ class AlumniAdmin(admin.ModelAdmin):
     search_fields = ("first_name", "last_name", "email", "reg_number")
     list_filter = (BirthdayTodayFilter, BirthMonthFilter, "graduation_year")
 
+    def get_search_results(self, request, queryset, search_term):
+        """Email/reg number prefix matches, plus ranked fuzzy matches from the search index."""
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        # Prefix lookups use the UPPER(...) text_pattern_ops indexes (migration 0025)
+        prefix = queryset.filter(Q(email__istartswith=search_term) | Q(reg_number__istartswith=search_term))
+        if '@' in search_term:
+            # An email's words (e.g. its domain) would fuzzy-match unrelated records
+            return prefix, False
+        ranked_ids = [a.pk for a in search_alumni(search_term, queryset=queryset.only('pk'), limit=200)]
+        return prefix | queryset.filter(pk__in=ranked_ids), False
+
 class DonationAdmin(admin.ModelAdmin):
     list_display = ("name", "email", "amount", "currency", "timestamp")
     list_filter = ("currency",)
@@ -0,0 +1,144 @@
+"""
+Audit log retention and archival.
+
+Rows older than the retention window are appended to gzip-compressed JSONL
+files partitioned by day (UTC)::
+
+    <archive dir>/2024/03/auditlog-2024-03-17.jsonl.gz
+
+and then deleted in bounded chunks. Each chunk is written and fsynced before
+its rows are deleted in the same transaction, so an interrupted run never
+loses rows; at worst a chunk is archived twice and readers should de-duplicate
+on ``id``. Re-runs append further gzip members to existing files, which
+``gzip.open`` reads back as one stream.
+
+``manifest.json`` in the archive directory lists every file with its row
+count, id and timestamp range, plus a record of each run.
+"""
+import datetime
+import gzip
+import json
+import os
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AuditLog
+
+MANIFEST_NAME = 'manifest.json'
+ARCHIVE_FIELDS = ('id', 'alumni_id', 'user_id', 'action', 'timestamp', 'ip_address', 'user_agent',
+                  'changed_fields', 'reason')
+
+
+def retention_cutoff(days=None, now=None):
+    """Return the timestamp before which audit rows are archived."""
+    days = settings.AUDIT_LOG_RETENTION_DAYS if days is None else days
+    return (now or timezone.now()) - datetime.timedelta(days=days)
+
+
+def partition_path(day):
+    return os.path.join(f"{day:%Y}", f"{day:%m}", f"auditlog-{day:%Y-%m-%d}.jsonl.gz")
+
+
+def load_manifest(directory):
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {'files': {}, 'runs': []}
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def save_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(f"{path}.tmp", 'w') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(f"{path}.tmp", path)
+
+
+def _serialize(row):
+    record = dict(zip(ARCHIVE_FIELDS, row))
+    record['timestamp'] = record['timestamp'].isoformat()
+    return record
+
+
+def _write_partition(directory, day, records):
+    relative = partition_path(day)
+    path = os.path.join(directory, relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'ab') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='ab') as handle:
+            for record in records:
+                handle.write(json.dumps(record, default=str).encode('utf-8'))
+                handle.write(b'\n')
+        raw.flush()
+        os.fsync(raw.fileno())
+    return relative
+
+
+def _update_entry(entry, records):
+    entry['rows'] = entry.get('rows', 0) + len(records)
+    ids = [record['id'] for record in records]
+    stamps = [record['timestamp'] for record in records]
+    entry['min_id'] = min(ids + ([entry['min_id']] if 'min_id' in entry else []))
+    entry['max_id'] = max(ids + ([entry['max_id']] if 'max_id' in entry else []))
+    entry['first_timestamp'] = min(stamps + ([entry['first_timestamp']] if 'first_timestamp' in entry else []))
+    entry['last_timestamp'] = max(stamps + ([entry['last_timestamp']] if 'last_timestamp' in entry else []))
+
+
+def archive_audit_logs(cutoff, directory=None, chunk_size=5000, max_chunks=None):
+    """
+    Archive and delete audit rows older than ``cutoff``, ``chunk_size`` rows at a time.
+
+    Returns the number of rows archived.
+    """
+    directory = directory or settings.AUDIT_ARCHIVE_DIR
+    os.makedirs(directory, exist_ok=True)
+    manifest = load_manifest(directory)
+    archived = 0
+    chunks = 0
+    while max_chunks is None or chunks < max_chunks:
+        with transaction.atomic():
+            rows = list(
+                AuditLog.objects.filter(timestamp__lt=cutoff)
+                .order_by('timestamp', 'id')
+                .values_list(*ARCHIVE_FIELDS)[:chunk_size]
+            )
+            if not rows:
+                break
+            partitions = defaultdict(list)
+            for row in rows:
+                stamp = row[ARCHIVE_FIELDS.index('timestamp')]
+                day = stamp.astimezone(datetime.timezone.utc).date() if timezone.is_aware(stamp) else stamp.date()
+                partitions[day].append(_serialize(row))
+            written = {_write_partition(directory, day, records): records for day, records in partitions.items()}
+            AuditLog.objects.filter(pk__in=[row[0] for row in rows]).delete()
+        for relative, records in written.items():
+            _update_entry(manifest['files'].setdefault(relative, {}), records)
+        archived += len(rows)
+        chunks += 1
+        save_manifest(directory, manifest)
+        if len(rows) < chunk_size:
+            break
+    if archived:
+        manifest['runs'].append({
+            'date': timezone.now().isoformat(),
+            'cutoff': cutoff.isoformat(),
+            'rows': archived,
+        })
+        save_manifest(directory, manifest)
+    return archived
+
+
+def read_partition(path):
+    """Yield the records stored in an archive file, skipping rows archived twice."""
+    seen = set()
+    with gzip.open(path, 'rt', encoding='utf-8') as handle:
+        for line in handle:
+            record = json.loads(line)
+            if record['id'] not in seen:
+                seen.add(record['id'])
+                yield record
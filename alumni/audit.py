@@ -0,0 +1,186 @@
+"""
+Batched, transaction-aware audit log writer.
+
+``log()`` does not insert straight away. Entries are buffered per transaction
+and merged so that each (alumnus, action) pair becomes a single ``AuditLog``
+row. The buffer is written with one ``bulk_create`` from
+``transaction.on_commit``, so entries recorded in a transaction (or savepoint)
+that rolls back are dropped along with it.
+
+``AuditMiddleware`` widens the scope to the whole request: entries from
+autocommit writes and from committed transactions are collected and written
+together when the response is ready.
+
+Entries for a record deleted before they are written (including the 'delete'
+entry itself) are stored unlinked, with ``alumni_id`` kept in
+``changed_fields``, like the rows the deletion set to NULL.
+"""
+import json
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+
+from .models import Alumni, AuditLog
+
+logger = logging.getLogger(__name__)
+_local = threading.local()
+
+# Alumni fields left out of change diffs; the derived ones follow from the fields they are built from
+UNAUDITED_FIELDS = {'id', 'registration_date', 'search_document', 'national_id_key', 'birthday_key', 'interest_mask'}
+
+
+def merge_changed_fields(existing, new):
+    """Merge ``new`` into ``existing``; ``{'old', 'new'}`` pairs keep the first old and the last new value."""
+    for name, value in new.items():
+        current = existing.get(name)
+        if isinstance(current, dict) and isinstance(value, dict) and 'old' in current and 'new' in value:
+            existing[name] = {'old': current['old'], 'new': value['new']}
+        elif name not in existing:
+            existing[name] = value
+    return existing
+
+
+class AuditBuffer:
+    """Pending audit entries keyed by ``(alumni_id, action)``."""
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, ip_address=None, user_agent=''):
+        self.using = using
+        self.ip_address = ip_address
+        self.user_agent = user_agent
+        self.entries = {}
+
+    def add(self, alumni_id, action, changed_fields=None, reason='', ip_address=None, user_agent=''):
+        entry = self.entries.get((alumni_id, action))
+        if entry is None:
+            self.entries[(alumni_id, action)] = {
+                'changed_fields': dict(changed_fields or {}),
+                'reasons': [reason] if reason else [],
+                'ip_address': ip_address,
+                'user_agent': user_agent or '',
+            }
+            return
+        merge_changed_fields(entry['changed_fields'], changed_fields or {})
+        if reason and reason not in entry['reasons']:
+            entry['reasons'].append(reason)
+        entry['ip_address'] = entry['ip_address'] or ip_address
+        entry['user_agent'] = entry['user_agent'] or user_agent or ''
+
+    def extend(self, other):
+        for (alumni_id, action), entry in other.entries.items():
+            for reason in entry['reasons'] or ['']:
+                self.add(alumni_id, action, entry['changed_fields'], reason,
+                         entry['ip_address'], entry['user_agent'])
+
+    def flush(self):
+        """Write the buffered entries with a single insert; returns the number of rows."""
+        entries, self.entries = self.entries, {}
+        if not entries:
+            return 0
+        existing = set(
+            Alumni.objects.using(self.using)
+            .filter(pk__in={alumni_id for alumni_id, _ in entries}).values_list('pk', flat=True)
+        )
+        for (alumni_id, _), entry in entries.items():
+            if alumni_id not in existing:
+                entry['changed_fields'].setdefault('alumni_id', alumni_id)
+        rows = [
+            AuditLog(
+                alumni_id=alumni_id if alumni_id in existing else None,
+                user=None,  # Always None to avoid AnonymousUser errors
+                action=action,
+                ip_address=entry['ip_address'] or self.ip_address,
+                user_agent=entry['user_agent'] or self.user_agent or '',
+                # Round-trip so dates, files etc. are stored as their string form
+                changed_fields=json.loads(json.dumps(entry['changed_fields'], default=str)),
+                reason='; '.join(entry['reasons']),
+            )
+            for (alumni_id, action), entry in entries.items()
+        ]
+        try:
+            AuditLog.objects.using(self.using).bulk_create(rows)
+        except Exception:
+            logger.exception("Failed to write %d audit log entries", len(rows))
+            return 0
+        return len(rows)
+
+
+def _request_buffer(using):
+    buffer = getattr(_local, 'request_buffer', None)
+    return buffer if buffer is not None and buffer.using == using else None
+
+
+def _commit(buffer):
+    target = _request_buffer(buffer.using)
+    if target is None:
+        buffer.flush()
+    else:
+        target.extend(buffer)
+
+
+def _transaction_buffer(connection):
+    """Return the buffer for the current transaction or savepoint, registering its commit hook."""
+    buffers = getattr(_local, 'transaction_buffers', None)
+    if buffers is None:
+        buffers = _local.transaction_buffers = {}
+    key = (connection.alias, tuple(connection.savepoint_ids))
+    buffer = buffers.get(key)
+    # A hook that already ran or was discarded by a rollback no longer covers this block
+    if buffer is None or not any(hook[1] == buffer.hook for hook in connection.run_on_commit):
+        buffer = AuditBuffer(connection.alias)
+        buffer.hook = lambda: _commit(buffer)
+        transaction.on_commit(buffer.hook, using=connection.alias)
+        buffers[key] = buffer
+    return buffer
+
+
+def log(alumni, action, changed_fields=None, reason='', ip_address=None, user_agent='', using=None):
+    """Record an audit entry for ``alumni``; it is written once the surrounding transaction commits."""
+    if not alumni or not alumni.pk:
+        return
+    using = using or router.db_for_write(AuditLog, instance=alumni)
+    connection = connections[using]
+    if connection.in_atomic_block:
+        buffer = _transaction_buffer(connection)
+    else:
+        buffer = _request_buffer(using)
+        if buffer is None:
+            buffer = AuditBuffer(using)
+            buffer.add(alumni.pk, action, changed_fields, reason, ip_address, user_agent)
+            buffer.flush()
+            return
+    buffer.add(alumni.pk, action, changed_fields, reason, ip_address, user_agent)
+
+
+@contextmanager
+def audit_scope(ip_address=None, user_agent='', using=DEFAULT_DB_ALIAS):
+    """Collect audit entries until the block exits, then write them together."""
+    previous = getattr(_local, 'request_buffer', None)
+    buffer = _local.request_buffer = AuditBuffer(using, ip_address, user_agent)
+    try:
+        yield buffer
+    finally:
+        _local.request_buffer = previous
+        if previous is not None and previous.using == using:
+            previous.extend(buffer)
+        else:
+            buffer.flush()
+
+
+def get_client_ip(request):
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if forwarded:
+        return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR')
+
+
+class AuditMiddleware:
+    """Write the audit entries recorded while handling a request in one batch."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with audit_scope(get_client_ip(request), request.META.get('HTTP_USER_AGENT', '')):
+            return self.get_response(request)
@@ -0,0 +1,73 @@
+"""
+Birthday lookups on top of ``Alumni.birthday_key``.
+
+The key is ``month * 100 + day`` of the date of birth (``229`` for 29
+February), so "whose birthday falls between two dates" becomes one or two
+range conditions on an indexed integer column instead of a per-row date
+computation. A range that crosses new year is split at December 31. Alumni
+born on 29 February celebrate on 1 March in non-leap years, matching what the
+birthday page has always shown.
+"""
+import calendar
+from datetime import date, timedelta
+
+from django.db.models import Q
+
+LEAP_DAY_KEY = 229
+
+
+def birthday_key(value):
+    """Return the month-day key of a date, or None."""
+    if value is None:
+        return None
+    return value.month * 100 + value.day
+
+
+def birthday_in_year(date_of_birth, year):
+    """Return the date a birthday is celebrated in ``year``."""
+    if date_of_birth.month == 2 and date_of_birth.day == 29 and not calendar.isleap(year):
+        return date(year, 3, 1)
+    return date_of_birth.replace(year=year)
+
+
+def next_birthday(date_of_birth, today):
+    """Return the first celebration of a birthday on or after ``today``."""
+    upcoming = birthday_in_year(date_of_birth, today.year)
+    if upcoming < today:
+        upcoming = birthday_in_year(date_of_birth, today.year + 1)
+    return upcoming
+
+
+def birthday_range_q(start, end):
+    """
+    Return a Q matching birthdays celebrated between ``start`` and ``end`` inclusive.
+
+    Ranges of a year or more match every birthday.
+    """
+    if end < start:
+        return Q(pk__in=[])
+    if end - start >= timedelta(days=365):
+        return Q(birthday_key__isnull=False)
+
+    start_key, end_key = birthday_key(start), birthday_key(end)
+    if start_key <= end_key:
+        condition = Q(birthday_key__gte=start_key, birthday_key__lte=end_key)
+    else:
+        # Wraps past December 31
+        condition = Q(birthday_key__gte=start_key) | Q(birthday_key__lte=end_key)
+
+    # Leap-day birthdays move to 1 March in non-leap years; the key range
+    # already covers 229 unless it starts exactly on 1 March
+    if start_key == 301 and not calendar.isleap(start.year):
+        condition |= Q(birthday_key=LEAP_DAY_KEY)
+    return condition
+
+
+def birthdays_between(queryset, start, end):
+    """Filter a queryset of Alumni to birthdays celebrated between two dates."""
+    return queryset.filter(birthday_range_q(start, end))
+
+
+def birthdays_on(queryset, day):
+    """Filter a queryset of Alumni to birthdays celebrated on ``day``."""
+    return birthdays_between(queryset, day, day)
@@ -0,0 +1,73 @@
+"""
+Generation-counter cache invalidation.
+
+Cached values are stored under keys that embed a per-namespace generation
+number. Invalidating a namespace just increments its counter, so every key
+built from the old generation is orphaned at once and ages out of the cache
+on its own; nothing has to track or delete individual keys.
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+GENERATION_TIMEOUT = None  # counters must outlive the values they version
+DEFAULT_TIMEOUT = 300
+
+DASHBOARD = 'dashboard'
+HOME = 'home'
+CONTENT = 'content'
+
+
+def _generation_key(namespace):
+    return f'generation:{namespace}'
+
+
+def get_generation(namespace):
+    """Return the current generation number of a namespace."""
+    generation = cache.get(_generation_key(namespace))
+    if generation is None:
+        cache.add(_generation_key(namespace), 1, GENERATION_TIMEOUT)
+        generation = cache.get(_generation_key(namespace), 1)
+    return generation
+
+
+def bump_generation(namespace):
+    """Invalidate everything cached under a namespace."""
+    try:
+        cache.incr(_generation_key(namespace))
+    except ValueError:
+        # The counter was evicted; any fresh number orphans the old keys
+        cache.add(_generation_key(namespace), 1, GENERATION_TIMEOUT)
+        cache.incr(_generation_key(namespace))
+
+
+def bump_on_commit(*namespaces):
+    """
+    Invalidate namespaces once the current transaction commits.
+
+    Bumping before commit would let a concurrent reader cache pre-commit data
+    under the new generation.
+    """
+    def bump():
+        for namespace in namespaces:
+            bump_generation(namespace)
+    transaction.on_commit(bump)
+
+
+def versioned_key(namespace, *parts):
+    """Build a cache key bound to the namespace's current generation."""
+    return ':'.join([namespace, str(get_generation(namespace)), *map(str, parts)])
+
+
+def get_or_compute(namespace, name, compute, timeout=DEFAULT_TIMEOUT):
+    """
+    Return the cached value for ``name`` in a namespace, computing it on a miss.
+
+    ``timeout`` may be a callable that receives the computed value, for values
+    that go stale at a time they determine themselves.
+    """
+    key = versioned_key(namespace, name)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout(value) if callable(timeout) else timeout)
+    return value
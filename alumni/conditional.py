@@ -0,0 +1,71 @@
+"""
+Conditional GET for the public content pages.
+
+Validators are built from the database, so every worker (and every restart)
+agrees on them and changes made anywhere, including ``QuerySet.update()``
+calls that stamp ``updated_at``, move them forward. Each page names the
+content tables it shows; for each one a single aggregate reads the row count
+(catching deletions) and the latest ``updated_at`` (catching inserts and
+edits, from the ``*_updated_idx`` indexes). Pages that also depend on the
+clock pass a ``changed_at`` function whose result moves the validators
+forward (e.g. when an event starts and moves to "past").
+
+Requests with pending flash messages always get a full response, since the
+messages are rendered into the page.
+"""
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from .models import Event
+
+
+def _has_pending_messages(request):
+    # len() loads the stored messages without marking them as read
+    return bool(len(get_messages(request)))
+
+
+def table_signature(model):
+    """``(row count, latest updated_at)`` of a content table."""
+    state = model._default_manager.aggregate(count=Count('pk'), latest=Max('updated_at'))
+    return state['count'], state['latest']
+
+
+def content_condition(*models, changed_at=None):
+    """
+    Return a ``condition()`` decorator validating against the given content tables.
+
+    ``changed_at(request, *args, **kwargs)`` may return a datetime (or None)
+    at which the page last changed for reasons other than a content edit.
+    """
+    def validators(request, *args, **kwargs):
+        if _has_pending_messages(request):
+            return None, None
+        parts, moments = [], []
+        for model in models:
+            count, latest = table_signature(model)
+            parts.append(f'{model._meta.model_name}.{count}.{latest.timestamp() if latest else 0:.6f}')
+            moments.append(latest)
+        extra = changed_at(request, *args, **kwargs) if changed_at else None
+        if extra is not None:
+            parts.append(f'{extra.timestamp():.6f}')
+            moments.append(extra)
+        moments = [moment for moment in moments if moment is not None]
+        return '-'.join(parts), max(moments) if moments else None
+
+    def etag_func(request, *args, **kwargs):
+        if not hasattr(request, '_content_validators'):
+            request._content_validators = validators(request, *args, **kwargs)
+        return request._content_validators[0]
+
+    def last_modified_func(request, *args, **kwargs):
+        etag_func(request, *args, **kwargs)
+        return request._content_validators[1]
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+
+def last_event_start(request, *args, **kwargs):
+    """When the most recent event started, i.e. when the upcoming/past split last moved."""
+    return Event.objects.filter(date__lte=timezone.now()).aggregate(latest=Max('date'))['latest']
@@ -0,0 +1,60 @@
+"""
+Country reference data for the registration form.
+
+The ISO country list is built from pycountry once per process into immutable
+tuples and lookup tables, and encoded once as JSON for the
+``reference/countries.json`` endpoint the registration form loads its options
+from. ``version()`` is a content hash of the list; it is used as the ETag and
+cache-busting ``?v=`` parameter, so browsers fetch the list once and keep it.
+"""
+import hashlib
+import json
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+import pycountry
+from django.utils.html import format_html
+
+Country = namedtuple('Country', ['code', 'name'])
+
+
+@lru_cache(maxsize=None)
+def countries():
+    """All ISO countries as ``(code, name)`` tuples, sorted by name."""
+    return tuple(sorted(
+        (Country(c.alpha_2, getattr(c, 'common_name', None) or getattr(c, 'name', '')) for c in pycountry.countries),
+        key=lambda country: country.name,
+    ))
+
+
+@lru_cache(maxsize=None)
+def _by_code():
+    return MappingProxyType({country.code: country for country in countries()})
+
+
+def country_name(code):
+    """Return the display name for an alpha-2 code, or None if it isn't one."""
+    country = _by_code().get((code or '').upper())
+    return country.name if country else None
+
+
+@lru_cache(maxsize=None)
+def countries_json():
+    """The country list encoded once as JSON bytes."""
+    return json.dumps([{'code': code, 'name': name} for code, name in countries()],
+                      separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def version():
+    """Short content hash of the country list."""
+    return hashlib.sha256(countries_json()).hexdigest()[:16]
+
+
+def selected_option_html(code):
+    """The ``<option>`` for a submitted alpha-2 code, preselected; empty if it isn't one."""
+    country = _by_code().get((code or '').upper())
+    if country is None:
+        return ''
+    return format_html('<option value="{}" selected>{}</option>', country.code, country.name)
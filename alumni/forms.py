@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
 from .models import Alumni, Donation
+from .lookup import find_alumni_by_national_id
 import re
 
 class AlumniRegistrationForm(forms.ModelForm):
@@ -120,7 +121,7 @@ class AlumniRegistrationForm(forms.ModelForm):
     
     def clean_national_id(self):
         national_id = self.cleaned_data.get('national_id')
-        if Alumni.objects.filter(national_id=national_id).exists():
+        if find_alumni_by_national_id(national_id) is not None:
             raise forms.ValidationError('This ID number is already registered.')
         return national_id
 
@@ -188,6 +189,31 @@ class AlumniFullUpdateForm(AlumniRegistrationForm):
         return self.cleaned_data.get('national_id')
 
 
+class AlumniImportForm(AlumniRegistrationForm):
+    """Validate one row of a bulk import file with the registration rules.
+
+    Uniqueness is resolved by the import itself (rows are upserted by email,
+    reg number or national ID in batches), so the per-row duplicate queries of
+    the registration form are skipped here.
+    """
+    data_protection_consent = forms.BooleanField(required=False)
+
+    class Meta(AlumniRegistrationForm.Meta):
+        pass
+
+    def clean_email(self):
+        email = self.cleaned_data.get('email')
+        if not re.match(r'^[^@]+@[^@]+\.[^@]+$', email):
+            raise forms.ValidationError('Please enter a valid email address.')
+        return email
+
+    def clean_national_id(self):
+        return self.cleaned_data.get('national_id')
+
+    def validate_unique(self):
+        pass
+
+
 class DonationForm(forms.ModelForm):
     """Form for alumni or friends to make a donation pledge."""
     class Meta:
@@ -199,4 +225,19 @@ class DonationForm(forms.ModelForm):
             'amount': forms.NumberInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md', 'step': '0.01'}),
             'currency': forms.TextInput(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md'}),
             'message': forms.Textarea(attrs={'class': 'w-full p-2 border border-gray-300 rounded-md', 'rows': 3}),
-        }
\ No newline at end of file
+        }
+
+class EventRSVPForm(forms.Form):
+    """Register for, or cancel a registration to, an event; the alumnus is identified by email and reg number."""
+    REGISTER = 'register'
+    CANCEL = 'cancel'
+
+    email = forms.EmailField()
+    reg_number = forms.CharField(max_length=50)
+    action = forms.ChoiceField(choices=[(REGISTER, 'Register'), (CANCEL, 'Cancel registration')], initial=REGISTER)
+
+    def get_alumni(self):
+        return Alumni.objects.filter(
+            email__iexact=self.cleaned_data['email'],
+            reg_number__iexact=self.cleaned_data['reg_number'].strip(),
+        ).first()
@@ -0,0 +1,93 @@
+"""
+Interest reporting and segmentation on top of ``Alumni.interest_mask``.
+
+With six flags there are only 64 possible masks, so a single
+``GROUP BY interest_mask`` (answered from the mask index) is enough to derive
+every per-interest count and every pairwise co-occurrence in Python. Segment
+filters ("career AND giving back") become ``interest_mask IN (...)`` over the
+masks that contain all requested bits, which the same index serves.
+"""
+from itertools import combinations
+
+from django.db.models import Count
+
+from .models import Alumni
+
+INTEREST_LABELS = {
+    'interest_networking': 'Networking/Peer Engagement',
+    'interest_academic': 'Academic & Mentorship',
+    'interest_career': 'Career & Professional Development',
+    'interest_giving_back': 'Giving Back',
+    'interest_stay_informed': 'Stay Informed',
+    'interest_other': 'Other',
+}
+
+INTEREST_BITS = {field: 1 << bit for bit, field in enumerate(Alumni.INTEREST_FIELDS)}
+ALL_MASKS = range(1 << len(Alumni.INTEREST_FIELDS))
+
+
+def mask_for(*fields):
+    """Combine interest field names into a single bitmask."""
+    mask = 0
+    for field in fields:
+        mask |= INTEREST_BITS[field]
+    return mask
+
+
+def masks_with_all(*fields):
+    """Return every mask that contains all of the given interests."""
+    required = mask_for(*fields)
+    return [m for m in ALL_MASKS if m & required == required]
+
+
+def with_interests(queryset, *fields):
+    """Filter to alumni that have *all* of the given interests."""
+    if not fields:
+        return queryset
+    return queryset.filter(interest_mask__in=masks_with_all(*fields))
+
+
+def with_any_interest(queryset, *fields):
+    """Filter to alumni that have *at least one* of the given interests."""
+    wanted = mask_for(*fields)
+    if not wanted:
+        return queryset
+    return queryset.filter(interest_mask__in=[m for m in ALL_MASKS if m & wanted])
+
+
+def mask_histogram(queryset=None):
+    """Return ``{mask: count}`` from a single grouped query."""
+    if queryset is None:
+        queryset = Alumni.objects.all()
+    rows = queryset.order_by().values_list('interest_mask').annotate(total=Count('pk'))
+    return dict(rows)
+
+
+def interest_report(queryset=None, histogram=None):
+    """
+    Return per-interest counts and pairwise co-occurrence from one aggregate pass.
+
+    Returns a dict with ``total``, ``counts`` ({label: n}) and ``co_occurrence``
+    (list of ``(label_a, label_b, n)`` sorted by n, descending).
+    """
+    if histogram is None:
+        histogram = mask_histogram(queryset)
+    counts = {field: 0 for field in Alumni.INTEREST_FIELDS}
+    pairs = {pair: 0 for pair in combinations(Alumni.INTEREST_FIELDS, 2)}
+    for mask, total in histogram.items():
+        present = [field for field in Alumni.INTEREST_FIELDS if mask & INTEREST_BITS[field]]
+        for field in present:
+            counts[field] += total
+        for pair in combinations(present, 2):
+            pairs[pair] += total
+
+    co_occurrence = sorted(
+        ((INTEREST_LABELS[a], INTEREST_LABELS[b], n) for (a, b), n in pairs.items()),
+        key=lambda row: row[2],
+        reverse=True,
+    )
+    return {
+        'total': sum(histogram.values()),
+        'counts': {INTEREST_LABELS[field]: counts[field] for field in Alumni.INTEREST_FIELDS},
+        'co_occurrence': co_occurrence,
+    }
@@ -0,0 +1,44 @@
+"""
+National ID lookup for the self-service update flow.
+
+National IDs are typed in many shapes ("63-123456 A 07", "63123456a07"), so
+matching is done on a normalized form. The normalized ID is stored only as a
+keyed hash (``Alumni.national_id_key``), which is indexed: lookups are a single
+index probe and the raw ID is never needed to find a record.
+"""
+import re
+
+from django.conf import settings
+from django.utils.crypto import salted_hmac
+
+from .models import Alumni
+
+_SEPARATORS = re.compile(r'[^0-9A-Z]+')
+
+
+def normalize_national_id(value):
+    """Upper-case the ID and drop spaces, dashes and other separators."""
+    return _SEPARATORS.sub('', str(value or '').upper())
+
+
+def national_id_key(value):
+    """Return the keyed hash used to index a national ID, or '' if it is blank."""
+    normalized = normalize_national_id(value)
+    if not normalized:
+        return ''
+    return salted_hmac(
+        'alumni.national_id',
+        normalized,
+        secret=getattr(settings, 'NATIONAL_ID_HASH_KEY', None) or settings.SECRET_KEY,
+        algorithm='sha256',
+    ).hexdigest()
+
+
+def find_alumni_by_national_id(national_id, queryset=None):
+    """Return the Alumni record matching ``national_id``, or None."""
+    key = national_id_key(national_id)
+    if not key:
+        return None
+    if queryset is None:
+        queryset = Alumni.objects.all()
+    return queryset.filter(national_id_key=key).order_by('pk').first()
@@ -0,0 +1,54 @@
+"""Django management command to archive audit log rows past the retention window.
+
+Old rows are appended to gzip-compressed JSONL files partitioned by day,
+recorded in the archive manifest, and deleted in bounded chunks (see
+alumni/archive.py).
+
+Usage:
+    python manage.py archive_audit_logs
+    python manage.py archive_audit_logs --days 365 --archive-dir /srv/archive/audit
+    python manage.py archive_audit_logs --chunk-size 2000 --max-chunks 50
+    python manage.py archive_audit_logs --dry-run
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from alumni.archive import archive_audit_logs, retention_cutoff
+from alumni.models import AuditLog
+
+
+class Command(BaseCommand):
+    help = "Move audit log rows older than the retention window into compressed archive files."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Retention window in days (default: AUDIT_LOG_RETENTION_DAYS)')
+        parser.add_argument('--archive-dir', help='Archive directory (default: AUDIT_ARCHIVE_DIR)')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows archived and deleted per transaction')
+        parser.add_argument('--max-chunks', type=int, help='Stop after this many chunks')
+        parser.add_argument('--dry-run', action='store_true', help='Report how many rows would be archived')
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else settings.AUDIT_LOG_RETENTION_DAYS
+        if days < 0:
+            raise CommandError("--days must not be negative.")
+        cutoff = retention_cutoff(days)
+        directory = options['archive_dir'] or settings.AUDIT_ARCHIVE_DIR
+
+        if options['dry_run']:
+            pending = AuditLog.objects.filter(timestamp__lt=cutoff).count()
+            self.stdout.write(f"[dry run] {pending} audit log row(s) older than {cutoff:%Y-%m-%d} would be archived.")
+            return
+
+        started = time.monotonic()
+        archived = archive_audit_logs(
+            cutoff, directory, chunk_size=max(1, options['chunk_size']), max_chunks=options['max_chunks']
+        )
+        elapsed = time.monotonic() - started
+        if not archived:
+            self.stdout.write(f"No audit log rows older than {cutoff:%Y-%m-%d}.")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {archived} audit log row(s) older than {cutoff:%Y-%m-%d} to {directory} in {elapsed:.1f}s."
+        ))
@@ -0,0 +1,81 @@
+"""Django management command to benchmark conditional GET on the public content pages.
+
+Replays a crawler over the newsletter, event, story and connect pages twice:
+once with plain GETs and once revalidating with the ETags from a first crawl.
+It reports the bytes sent, CPU time, wall time and queries for each pass.
+Only GET requests are made, so it is safe to run against a populated database.
+
+Usage:
+    python manage.py bench_conditional_get
+    python manage.py bench_conditional_get --rounds 5 --limit 100
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from alumni.models import Event, Newsletter
+
+
+class Command(BaseCommand):
+    help = "Measure bandwidth and CPU saved by ETag/Last-Modified revalidation of the public pages."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=3, help='Times to replay the crawl per pass')
+        parser.add_argument('--limit', type=int, default=50, help='Detail pages per content type')
+        parser.add_argument('--host', default='localhost', help='Host header (must be in ALLOWED_HOSTS)')
+
+    def handle(self, *args, **options):
+        urls = self.crawl_urls(max(0, options['limit']))
+        client = Client(HTTP_HOST=options['host'])
+
+        validators = {}
+        for url in urls:
+            response = client.get(url)
+            if response.status_code == 200 and response.has_header('ETag'):
+                validators[url] = response['ETag']
+        self.stdout.write(f"Crawling {len(urls)} URL(s), {len(validators)} with validators, "
+                          f"{options['rounds']} round(s) per pass.")
+
+        rounds = max(1, options['rounds'])
+        plain = self.replay(client, urls, rounds, {})
+        conditional = self.replay(client, urls, rounds, validators)
+
+        self.stdout.write(f"{'':14}{'requests':>10}{'304s':>8}{'bytes':>12}{'cpu ms':>10}{'wall ms':>10}{'queries':>9}")
+        for label, stats in (('plain GET', plain), ('conditional', conditional)):
+            self.stdout.write(
+                f"{label:14}{stats['requests']:>10}{stats['not_modified']:>8}{stats['bytes']:>12}"
+                f"{stats['cpu'] * 1000:>10.1f}{stats['wall'] * 1000:>10.1f}{stats['queries']:>9}"
+            )
+        saved_bytes = 1 - conditional['bytes'] / plain['bytes'] if plain['bytes'] else 0
+        saved_cpu = 1 - conditional['cpu'] / plain['cpu'] if plain['cpu'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Revalidation saved {saved_bytes:.0%} of response bytes and {saved_cpu:.0%} of CPU time."
+        ))
+
+    def crawl_urls(self, limit):
+        urls = [reverse(name) for name in ('alumni:newsletters', 'alumni:events', 'alumni:stories', 'alumni:connect')]
+        urls += [reverse('alumni:newsletter_detail', args=[pk])
+                 for pk in Newsletter.objects.order_by('-pk').values_list('pk', flat=True)[:limit]]
+        urls += [reverse('alumni:event_detail', args=[pk])
+                 for pk in Event.objects.order_by('-pk').values_list('pk', flat=True)[:limit]]
+        return urls
+
+    def replay(self, client, urls, rounds, validators):
+        stats = {'requests': 0, 'not_modified': 0, 'bytes': 0, 'queries': 0}
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(rounds):
+                for url in urls:
+                    headers = {'HTTP_IF_NONE_MATCH': validators[url]} if url in validators else {}
+                    response = client.get(url, **headers)
+                    stats['requests'] += 1
+                    stats['not_modified'] += response.status_code == 304
+                    stats['bytes'] += len(response.content)
+        stats['cpu'] = time.process_time() - cpu_started
+        stats['wall'] = time.perf_counter() - wall_started
+        stats['queries'] = len(queries)
+        return stats
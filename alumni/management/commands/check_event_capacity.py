@@ -0,0 +1,127 @@
+"""Django management command to check event capacity enforcement under concurrent registrations.
+
+Creates a temporary event with a capacity limit, registers existing alumni
+for it from parallel threads (one database connection each), then cancels
+some confirmed registrations in parallel. After each phase it checks that the
+event was never overbooked, that ``Event.confirmed_count`` matches the
+confirmed rows, and that the waitlist was promoted in order. The event and
+its registrations are deleted afterwards unless --keep is given.
+
+Run it against PostgreSQL to exercise real row locking; on SQLite it runs
+with a single worker and only checks the bookkeeping.
+
+Usage:
+    python manage.py check_event_capacity
+    python manage.py check_event_capacity --registrations 500 --capacity 100 --workers 32
+    python manage.py check_event_capacity --cancel 20 --keep
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from alumni import rsvp
+from alumni.models import Alumni, Event, EventRegistration
+
+
+def _in_thread(func, *args):
+    try:
+        return func(*args)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Fire parallel registrations at a temporary event and verify capacity is never exceeded."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--registrations', type=int, default=200, help='Alumni registering in parallel')
+        parser.add_argument('--capacity', type=int, default=50, help='Places on the temporary event')
+        parser.add_argument('--workers', type=int, default=16, help='Concurrent threads')
+        parser.add_argument('--cancel', type=int, default=10, help='Confirmed registrations to cancel afterwards')
+        parser.add_argument('--keep', action='store_true', help="Don't delete the temporary event")
+
+    def handle(self, *args, **options):
+        wanted, capacity = options['registrations'], options['capacity']
+        if wanted < 1 or capacity < 0:
+            raise CommandError("--registrations must be positive and --capacity must not be negative.")
+        alumni = list(Alumni.objects.order_by('pk')[:wanted])
+        if len(alumni) < wanted:
+            raise CommandError(f"Need {wanted} alumni in the database, found {len(alumni)}.")
+        if connection.vendor == 'sqlite' and options['workers'] > 1:
+            # Concurrent write transactions fail with "database is locked" rather than waiting
+            self.stdout.write(self.style.WARNING("SQLite can't run concurrent writers; using one worker. "
+                                                 "Use PostgreSQL to test row locking."))
+            options['workers'] = 1
+
+        event = Event.objects.create(
+            title='Capacity check (temporary)', description='Created by check_event_capacity.',
+            date=timezone.now() + timedelta(days=1), location='N/A',
+            registration_required=True, capacity=capacity,
+        )
+        try:
+            self.run_checks(event, alumni, options)
+        finally:
+            if options['keep']:
+                self.stdout.write(f"Kept event {event.pk}.")
+            else:
+                event.delete()
+
+    def run_checks(self, event, alumni, options):
+        workers = max(1, options['workers'])
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda alum: _in_thread(rsvp.register, event, alum), alumni))
+        elapsed = time.perf_counter() - started
+        confirmed = sum(registration.status == EventRegistration.CONFIRMED for registration in results)
+        self.stdout.write(f"Registered {len(alumni)} alumni with {workers} worker(s) in {elapsed * 1000:.0f}ms: "
+                          f"{confirmed} confirmed, {len(results) - confirmed} waitlisted.")
+        self.verify(event, expected_confirmed=min(event.capacity, len(alumni)), total=len(alumni))
+
+        to_cancel = [registration.alumni for registration in results
+                     if registration.status == EventRegistration.CONFIRMED][:max(0, options['cancel'])]
+        if not to_cancel:
+            self.stdout.write(self.style.SUCCESS("Capacity held under concurrent registration."))
+            return
+        waitlist = list(
+            EventRegistration.objects.filter(event=event, status=EventRegistration.WAITLISTED)
+            .order_by('registration_date', 'pk').values_list('pk', flat=True)
+        )
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda alum: _in_thread(rsvp.cancel, event, alum), to_cancel))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"Cancelled {len(to_cancel)} registration(s) in {elapsed * 1000:.0f}ms.")
+        expected = min(event.capacity, len(alumni) - len(to_cancel))
+        self.verify(event, expected_confirmed=expected, total=len(alumni) - len(to_cancel))
+
+        promoted = set(waitlist[:expected - (min(event.capacity, len(alumni)) - len(to_cancel))])
+        confirmed_ids = set(
+            EventRegistration.objects.filter(event=event, status=EventRegistration.CONFIRMED).values_list('pk', flat=True)
+        )
+        if not promoted <= confirmed_ids:
+            raise CommandError("The waitlist was not promoted in registration order.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Capacity held under concurrent registration; {len(promoted)} waitlisted registration(s) promoted in order."
+        ))
+
+    def verify(self, event, expected_confirmed, total):
+        event.refresh_from_db(fields=['confirmed_count'])
+        rows = EventRegistration.objects.filter(event=event)
+        confirmed = rows.filter(status=EventRegistration.CONFIRMED).count()
+        active = rows.exclude(status=EventRegistration.CANCELLED).count()
+        problems = []
+        if confirmed > event.capacity:
+            problems.append(f"overbooked: {confirmed} confirmed for {event.capacity} places")
+        if confirmed != expected_confirmed:
+            problems.append(f"{confirmed} confirmed, expected {expected_confirmed}")
+        if event.confirmed_count != confirmed:
+            problems.append(f"confirmed_count is {event.confirmed_count} but {confirmed} rows are confirmed")
+        if active != total:
+            problems.append(f"{active} active registrations, expected {total}")
+        if problems:
+            raise CommandError("; ".join(problems))
@@ -0,0 +1,295 @@
+"""Django management command to bulk import alumni from a CSV or XLSX file.
+
+Each row is validated with the registration form rules and upserted in
+batches keyed by email, reg number or national ID. Saves go through
+``bulk_create``/``bulk_update`` so no per-row signals fire; audit entries are
+written in bulk alongside each batch.
+
+Usage:
+    python manage.py import_alumni graduates.csv
+    python manage.py import_alumni graduates.xlsx --batch-size 2000 --dry-run
+    python manage.py import_alumni graduates.csv --resume
+"""
+import csv
+import json
+import os
+import time
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.db.models import Q
+
+from alumni.countries import country_name
+from alumni.forms import AlumniImportForm
+from alumni.lookup import national_id_key
+from alumni.birthdays import birthday_key
+from alumni.cache import DASHBOARD, bump_on_commit
+from alumni.models import Alumni, AuditLog
+from alumni.rollups import record_changes, rollup_snapshot
+from alumni.search import build_search_document, index_alumni
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'x', 'on'}
+KEY_FIELDS = ('email', 'reg_number', 'national_id_key')
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = "Bulk import alumni from a CSV or XLSX file using batched upserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file whose header row uses Alumni field names')
+        parser.add_argument('--format', choices=['csv', 'xlsx'], help='File format (default: from extension)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per upsert batch')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report without writing')
+        parser.add_argument('--resume', action='store_true', help='Skip rows recorded in the checkpoint file')
+        parser.add_argument('--checkpoint', help='Checkpoint file (default: <path>.checkpoint)')
+        parser.add_argument('--reason', default='Bulk alumni import', help='Reason recorded in the audit log')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+        fmt = options['format'] or ('xlsx' if path.lower().endswith('.xlsx') else 'csv')
+        batch_size = max(1, options['batch_size'])
+        dry_run = options['dry_run']
+        checkpoint_path = options['checkpoint'] or f"{path}.checkpoint"
+        self.reason = options['reason']
+
+        start_row = self.read_checkpoint(checkpoint_path, path) if options['resume'] else 0
+        if start_row:
+            self.stdout.write(f"Resuming after row {start_row}.")
+
+        stats = {'processed': 0, 'created': 0, 'updated': 0, 'unchanged': 0, 'invalid': 0}
+        started = time.monotonic()
+        rows_done = start_row
+        batch = []
+
+        for row_number, row in enumerate(self.read_rows(path, fmt), start=1):
+            if row_number <= start_row:
+                continue
+            batch.append((row_number, row))
+            if len(batch) >= batch_size:
+                self.process_batch(batch, stats, dry_run)
+                rows_done = batch[-1][0]
+                if not dry_run:
+                    self.write_checkpoint(checkpoint_path, path, rows_done)
+                batch = []
+        if batch:
+            self.process_batch(batch, stats, dry_run)
+            rows_done = batch[-1][0]
+
+        if not dry_run and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+        elapsed = time.monotonic() - started
+        rate = stats['processed'] / elapsed if elapsed else 0
+        prefix = "[dry run] " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Processed {stats['processed']} row(s) in {elapsed:.1f}s ({rate:.0f} rows/s): "
+            f"{stats['created']} created, {stats['updated']} updated, "
+            f"{stats['unchanged']} unchanged, {stats['invalid']} invalid."
+        ))
+
+    # ------------------------------------------------------------------ input
+
+    def read_rows(self, path, fmt):
+        """Yield each data row as a dict keyed by the header row."""
+        if fmt == 'xlsx':
+            try:
+                from openpyxl import load_workbook
+            except ImportError:
+                raise CommandError("Reading XLSX files requires openpyxl (pip install openpyxl).")
+            workbook = load_workbook(path, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = [str(cell or '').strip() for cell in next(rows, [])]
+                for values in rows:
+                    yield {key: ('' if value is None else value) for key, value in zip(header, values)}
+            finally:
+                workbook.close()
+        else:
+            with open(path, newline='', encoding='utf-8-sig') as handle:
+                for row in csv.DictReader(handle):
+                    yield {(key or '').strip(): value for key, value in row.items()}
+
+    def prepare_row(self, row):
+        """Turn a raw file row into form data."""
+        data = {}
+        for name, value in row.items():
+            try:
+                field = Alumni._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+            if isinstance(field, models.BooleanField):
+                if str(value).lower() in TRUE_VALUES:
+                    data[name] = 'on'
+                continue
+            if name == 'country' and isinstance(value, str) and len(value) == 2:
+                value = country_name(value) or value
+            data[name] = value
+        return data
+
+    # ------------------------------------------------------------------ upsert
+
+    def process_batch(self, batch, stats, dry_run):
+        valid = []
+        for row_number, row in batch:
+            stats['processed'] += 1
+            form = AlumniImportForm(self.prepare_row(row))
+            if not form.is_valid():
+                stats['invalid'] += 1
+                if stats['invalid'] <= MAX_REPORTED_ERRORS:
+                    errors = '; '.join(f"{field}: {' '.join(msgs)}" for field, msgs in form.errors.items())
+                    self.stderr.write(f"Row {row_number}: {errors}")
+                continue
+            # Only apply columns present in the file so updates don't blank other fields
+            columns = [name for name in form.cleaned_data if name in row]
+            valid.append((row_number, {name: form.cleaned_data[name] for name in columns}))
+
+        if not valid:
+            return
+        if dry_run:
+            created, updated, unchanged, conflicts = self.plan_batch(valid)
+        else:
+            with transaction.atomic():
+                created, updated, unchanged, conflicts = self.plan_batch(valid)
+                self.write_batch(created, updated)
+        for row_number, message in conflicts:
+            stats['invalid'] += 1
+            if stats['invalid'] <= MAX_REPORTED_ERRORS:
+                self.stderr.write(f"Row {row_number}: {message}")
+        stats['created'] += len(created)
+        stats['updated'] += len(updated)
+        stats['unchanged'] += unchanged
+
+    def plan_batch(self, rows):
+        """
+        Match ``(row_number, data)`` rows to existing records with one query and work out what to write.
+
+        Returns ``(new_objects, {pk: (obj, changes)}, unchanged_count, conflicts)``,
+        where ``conflicts`` lists ``(row_number, message)`` for rows whose keys
+        match different records; those rows are skipped.
+        """
+        row_keys = [self.match_keys(row) for _, row in rows]
+        keys = {field: {row[field] for row in row_keys if row[field]} for field in KEY_FIELDS}
+        lookup = Q(pk__in=[])
+        for field, values in keys.items():
+            if values:
+                lookup |= Q(**{f'{field}__in': values})
+        index = {field: {} for field in KEY_FIELDS}
+        for alumni in Alumni.objects.filter(lookup):
+            alumni._rollup_before = rollup_snapshot(alumni)
+            for field in KEY_FIELDS:
+                value = getattr(alumni, field)
+                if value:
+                    index[field][value] = alumni
+
+        created = []
+        updated = {}
+        conflicts = []
+        matched = 0
+        for (row_number, row), row_key in zip(rows, row_keys):
+            found = {}
+            for field in KEY_FIELDS:
+                if row_key[field] in index[field]:
+                    found.setdefault(id(index[field][row_key[field]]), []).append(field)
+            if len(found) > 1:
+                # Updating one record would collide with the other's unique keys
+                groups = '; '.join(', '.join(fields) for fields in found.values())
+                conflicts.append((row_number, f"keys match different existing records ({groups})"))
+                continue
+            alumni = next(
+                (index[field][row_key[field]] for field in KEY_FIELDS if row_key[field] in index[field]),
+                None
+            )
+            if alumni is None:
+                alumni = Alumni(**row)
+                created.append(alumni)
+            else:
+                matched += 1 if alumni.pk else 0
+                changes = {}
+                for name, value in row.items():
+                    old = getattr(alumni, name)
+                    if old != value:
+                        changes[name] = {'old': str(old), 'new': str(value)}
+                        setattr(alumni, name, value)
+                if changes and alumni.pk:
+                    updated.setdefault(alumni.pk, (alumni, {}))[1].update(changes)
+            alumni.national_id_key = national_id_key(alumni.national_id)
+            # Later rows in the same batch with the same key merge into this record
+            for field in KEY_FIELDS:
+                value = getattr(alumni, field)
+                if value:
+                    index[field][value] = alumni
+        return created, updated, matched - len(updated), conflicts
+
+    def match_keys(self, row):
+        """Return the values a row is matched on, keyed like KEY_FIELDS."""
+        return {
+            'email': row.get('email') or None,
+            'reg_number': row.get('reg_number') or None,
+            'national_id_key': national_id_key(row.get('national_id')) or None,
+        }
+
+    def write_batch(self, created, updated):
+        for alumni in created:
+            alumni.search_document = build_search_document(alumni)
+            alumni.birthday_key = birthday_key(alumni.date_of_birth)
+            alumni.interest_mask = alumni.compute_interest_mask()
+        Alumni.objects.bulk_create(created)
+
+        changed_objects = [alumni for alumni, _ in updated.values()]
+        if changed_objects:
+            fields = {name for _, changes in updated.values() for name in changes}
+            for alumni in changed_objects:
+                alumni.search_document = build_search_document(alumni)
+                alumni.birthday_key = birthday_key(alumni.date_of_birth)
+                alumni.interest_mask = alumni.compute_interest_mask()
+            fields |= {'search_document'}
+            if 'national_id' in fields:
+                fields.add('national_id_key')
+            if 'date_of_birth' in fields:
+                fields.add('birthday_key')
+            if fields & set(Alumni.INTEREST_FIELDS):
+                fields.add('interest_mask')
+            Alumni.objects.bulk_update(changed_objects, sorted(fields))
+
+        index_alumni(created + changed_objects)
+
+        record_changes(
+            [(None, rollup_snapshot(alumni)) for alumni in created]
+            + [(alumni._rollup_before, rollup_snapshot(alumni)) for alumni in changed_objects]
+        )
+
+        audit_rows = [
+            AuditLog(alumni=alumni, action='create', reason=self.reason,
+                     changed_fields={'status': 'Bulk import', 'email': alumni.email})
+            for alumni in created
+        ] + [
+            AuditLog(alumni=alumni, action='update', reason=self.reason,
+                     changed_fields=changes)
+            for alumni, changes in updated.values()
+        ]
+        AuditLog.objects.bulk_create(audit_rows)
+        # Bulk writes skip the save signals that normally invalidate these
+        bump_on_commit(DASHBOARD)
+
+    # ------------------------------------------------------------------ checkpoint
+
+    def read_checkpoint(self, checkpoint_path, path):
+        if not os.path.exists(checkpoint_path):
+            return 0
+        with open(checkpoint_path) as handle:
+            checkpoint = json.load(handle)
+        source = checkpoint.get('source')
+        if source != os.path.abspath(path):
+            raise CommandError(f"Checkpoint {checkpoint_path} belongs to {source}, not {os.path.abspath(path)}; "
+                               "refusing to resume.")
+        return int(checkpoint.get('rows_done', 0))
+
+    def write_checkpoint(self, checkpoint_path, path, rows_done):
+        with open(checkpoint_path, 'w') as handle:
+            json.dump({'source': os.path.abspath(path), 'rows_done': rows_done}, handle)
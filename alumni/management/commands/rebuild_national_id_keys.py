@@ -0,0 +1,57 @@
+"""Django management command to recompute the national ID lookup keys.
+
+``Alumni.national_id_key`` is a keyed hash of the normalized national ID (see
+alumni/lookup.py). Run this after changing NATIONAL_ID_HASH_KEY (or, where it
+is unset, SECRET_KEY); until then the self-service lookup finds nobody. Only
+rows whose key differs are written, so it is cheap to re-run.
+
+Usage:
+    python manage.py rebuild_national_id_keys
+    python manage.py rebuild_national_id_keys --batch-size 5000 --dry-run
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from alumni.lookup import national_id_key
+from alumni.models import Alumni
+
+
+class Command(BaseCommand):
+    help = "Recompute Alumni.national_id_key with the current hash key."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows read and updated per batch')
+        parser.add_argument('--dry-run', action='store_true', help='Report how many keys would change')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        started = time.monotonic()
+        checked = changed = 0
+        batch = []
+        rows = Alumni.objects.only('pk', 'national_id', 'national_id_key').order_by('pk').iterator(chunk_size=batch_size)
+        for alumni in rows:
+            checked += 1
+            key = national_id_key(alumni.national_id)
+            if alumni.national_id_key == key:
+                continue
+            alumni.national_id_key = key
+            batch.append(alumni)
+            if len(batch) >= batch_size:
+                changed += self.flush(batch, options['dry_run'])
+                batch = []
+        changed += self.flush(batch, options['dry_run'])
+
+        elapsed = time.monotonic() - started
+        prefix = "[dry run] " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Checked {checked} alumni in {elapsed:.1f}s; {changed} national ID key(s) "
+            f"{'would be ' if options['dry_run'] else ''}updated."
+        ))
+
+    def flush(self, batch, dry_run):
+        if batch and not dry_run:
+            with transaction.atomic():
+                Alumni.objects.bulk_update(batch, ['national_id_key'])
+        return len(batch)
@@ -0,0 +1,23 @@
+"""Django management command to recompute the alumni report rollups.
+
+Rollups are maintained incrementally by signals; run this after bulk changes
+that bypass them (``QuerySet.update``, raw SQL) to reconcile any drift.
+
+Usage:
+    python manage.py rebuild_rollups
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from alumni.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the alumni report rollup tables from the Alumni table."
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        groups = rebuild_rollups()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {groups} rollup group(s) in {elapsed:.1f}s."))
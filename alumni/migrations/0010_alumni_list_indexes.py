@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0009_alumni_date_of_engagement'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alumni',
+            index=models.Index(fields=['registration_date', 'id'], name='alumni_regdate_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alumni',
+            index=models.Index(fields=['last_name', 'id'], name='alumni_lastname_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alumni',
+            index=models.Index(fields=['graduation_year', 'id'], name='alumni_gradyear_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alumni',
+            index=models.Index(fields=['country'], name='alumni_country_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alumni',
+            index=models.Index(fields=['degree_level'], name='alumni_degree_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alumni',
+            index=models.Index(fields=['employment_status'], name='alumni_employment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alumni',
+            index=models.Index(fields=['is_verified', 'registration_date'], name='alumni_verified_regdate_idx'),
+        ),
+    ]
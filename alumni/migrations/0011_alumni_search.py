@@ -0,0 +1,74 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_search_documents(apps, schema_editor):
+    from alumni.search import build_search_document, trigrams
+
+    Alumni = apps.get_model('alumni', 'Alumni')
+    AlumniSearchTrigram = apps.get_model('alumni', 'AlumniSearchTrigram')
+    use_fallback_index = schema_editor.connection.vendor != 'postgresql'
+
+    batch = []
+    for alumni in Alumni.objects.all().iterator(chunk_size=2000):
+        alumni.search_document = build_search_document(alumni)
+        batch.append(alumni)
+        if len(batch) >= 2000:
+            _flush(Alumni, AlumniSearchTrigram, batch, trigrams, use_fallback_index)
+            batch = []
+    if batch:
+        _flush(Alumni, AlumniSearchTrigram, batch, trigrams, use_fallback_index)
+
+
+def _flush(Alumni, AlumniSearchTrigram, batch, trigrams, use_fallback_index):
+    Alumni.objects.bulk_update(batch, ['search_document'])
+    if use_fallback_index:
+        AlumniSearchTrigram.objects.bulk_create([
+            AlumniSearchTrigram(alumni_id=alumni.pk, trigram=gram)
+            for alumni in batch
+            for gram in trigrams(alumni.search_document)
+        ], batch_size=1000)
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS alumni_search_document_trgm '
+            'ON alumni_alumni USING gin (search_document gin_trgm_ops)'
+        )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS alumni_search_document_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0010_alumni_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumni',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.CreateModel(
+            name='AlumniSearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('alumni', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_trigrams', to='alumni.alumni')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['trigram', 'alumni'], name='alumni_search_trigram_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
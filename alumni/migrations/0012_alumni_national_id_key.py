@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:18
+
+from django.db import migrations, models
+
+
+def backfill_national_id_keys(apps, schema_editor):
+    from alumni.lookup import national_id_key
+
+    Alumni = apps.get_model('alumni', 'Alumni')
+    batch = []
+    for alumni in Alumni.objects.only('pk', 'national_id').iterator(chunk_size=2000):
+        alumni.national_id_key = national_id_key(alumni.national_id)
+        batch.append(alumni)
+        if len(batch) >= 2000:
+            Alumni.objects.bulk_update(batch, ['national_id_key'])
+            batch = []
+    if batch:
+        Alumni.objects.bulk_update(batch, ['national_id_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0011_alumni_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumni',
+            name='national_id_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(backfill_national_id_keys, migrations.RunPython.noop),
+    ]
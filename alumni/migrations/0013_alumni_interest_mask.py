@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:24
+
+from django.db import migrations, models
+from django.db.models import Case, IntegerField, Value, When
+
+INTEREST_FIELDS = (
+    'interest_networking',
+    'interest_academic',
+    'interest_career',
+    'interest_giving_back',
+    'interest_stay_informed',
+    'interest_other',
+)
+
+
+def backfill_interest_mask(apps, schema_editor):
+    Alumni = apps.get_model('alumni', 'Alumni')
+    # One set-based UPDATE: sum the bit of every flag that is set
+    mask = sum(
+        Case(When(**{field: True}, then=Value(1 << bit)), default=Value(0), output_field=IntegerField())
+        for bit, field in enumerate(INTEREST_FIELDS)
+    )
+    Alumni.objects.update(interest_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0012_alumni_national_id_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumni',
+            name='interest_mask',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_interest_mask, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:25
+
+from django.db import migrations, models
+from django.db.models import Count
+
+ROLLUP_DIMENSIONS = (
+    'country',
+    'graduation_year',
+    'degree_level',
+    'employment_status',
+    'is_verified',
+    'interest_mask',
+)
+
+
+def _as_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return str(value)
+
+
+def build_rollups(apps, schema_editor):
+    Alumni = apps.get_model('alumni', 'Alumni')
+    AlumniRollup = apps.get_model('alumni', 'AlumniRollup')
+    rows = []
+    for dimension in ROLLUP_DIMENSIONS:
+        grouped = Alumni.objects.order_by().values_list(dimension).annotate(total=Count('pk'))
+        rows.extend(
+            AlumniRollup(dimension=dimension, value=_as_value(value), total=total)
+            for value, total in grouped
+        )
+    AlumniRollup.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0013_alumni_interest_mask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlumniRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=30)),
+                ('value', models.CharField(blank=True, max_length=200)),
+                ('total', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='alumnirollup',
+            constraint=models.UniqueConstraint(fields=('dimension', 'value'), name='unique_alumni_rollup'),
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
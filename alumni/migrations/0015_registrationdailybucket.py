@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:26
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def build_buckets(apps, schema_editor):
+    Alumni = apps.get_model('alumni', 'Alumni')
+    RegistrationDailyBucket = apps.get_model('alumni', 'RegistrationDailyBucket')
+    totals = Counter()
+    grouped = (
+        Alumni.objects.order_by()
+        .annotate(day=TruncDate('registration_date'))
+        .values_list('day', 'graduation_year', 'programme_studied')
+        .annotate(total=Count('pk'))
+    )
+    for day, graduation_year, programme, total in grouped:
+        totals[(day, graduation_year, (programme or '').strip())] += total
+    RegistrationDailyBucket.objects.bulk_create(
+        [
+            RegistrationDailyBucket(day=day, graduation_year=graduation_year, programme_studied=programme, total=total)
+            for (day, graduation_year, programme), total in totals.items()
+        ],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0014_alumnirollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationDailyBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('graduation_year', models.PositiveIntegerField()),
+                ('programme_studied', models.CharField(max_length=200)),
+                ('total', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='registrationdailybucket',
+            constraint=models.UniqueConstraint(fields=('day', 'graduation_year', 'programme_studied'), name='unique_registration_bucket'),
+        ),
+        migrations.RunPython(build_buckets, migrations.RunPython.noop),
+    ]
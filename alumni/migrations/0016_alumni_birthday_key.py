@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:30
+
+from django.db import migrations, models
+from django.db.models.functions import ExtractDay, ExtractMonth
+
+
+def backfill_birthday_key(apps, schema_editor):
+    Alumni = apps.get_model('alumni', 'Alumni')
+    Alumni.objects.filter(date_of_birth__isnull=False).update(
+        birthday_key=ExtractMonth('date_of_birth') * 100 + ExtractDay('date_of_birth')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0015_registrationdailybucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumni',
+            name='birthday_key',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_birthday_key, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0016_alumni_birthday_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alumni',
+            index=models.Index(fields=['programme_studied'], name='alumni_programme_idx'),
+        ),
+    ]
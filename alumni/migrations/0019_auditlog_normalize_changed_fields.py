@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:42
+
+import json
+
+from django.db import migrations
+
+
+def normalize_changed_fields(apps, schema_editor):
+    """Make every stored value valid JSON so the column can be converted."""
+    AuditLog = apps.get_model('alumni', 'AuditLog')
+    AuditLog.objects.filter(changed_fields='').update(changed_fields='{}')
+    batch = []
+    for log in AuditLog.objects.only('changed_fields').iterator(chunk_size=2000):
+        try:
+            json.loads(log.changed_fields)
+        except ValueError:
+            # Keep unparseable legacy text rather than dropping it
+            log.changed_fields = json.dumps({'legacy': log.changed_fields})
+            batch.append(log)
+        if len(batch) >= 2000:
+            AuditLog.objects.bulk_update(batch, ['changed_fields'])
+            batch = []
+    if batch:
+        AuditLog.objects.bulk_update(batch, ['changed_fields'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0018_auditlog_timestamp_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_changed_fields, migrations.RunPython.noop),
+    ]
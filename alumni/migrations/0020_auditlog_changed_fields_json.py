@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:42
+
+from django.db import migrations, models
+
+
+def create_changed_fields_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS auditlog_changed_fields_gin '
+            'ON alumni_auditlog USING gin (changed_fields)'
+        )
+
+
+def drop_changed_fields_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS auditlog_changed_fields_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0019_auditlog_normalize_changed_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='changed_fields',
+            field=models.JSONField(blank=True, default=dict, help_text='Changed fields and their values'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['alumni', 'timestamp', 'id'], name='auditlog_alumni_ts_idx'),
+        ),
+        migrations.RunPython(create_changed_fields_index, drop_changed_fields_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0021_event_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(fields=['published_date', 'id'], name='newsletter_published_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:49
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_registrations(apps, schema_editor):
+    # Every existing registration is confirmed
+    Event = apps.get_model('alumni', 'Event')
+    events = Event.objects.annotate(registered=Count('registrations')).filter(registered__gt=0)
+    for event in events.only('pk'):
+        Event.objects.filter(pk=event.pk).update(confirmed_count=event.registered)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0022_newsletter_published_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, help_text='Leave blank for unlimited places', null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='confirmed_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='eventregistration',
+            name='status',
+            field=models.CharField(choices=[('confirmed', 'Confirmed'), ('waitlisted', 'Waitlisted'), ('cancelled', 'Cancelled')], default='confirmed', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(fields=['event', 'status', 'registration_date'], name='eventreg_waitlist_idx'),
+        ),
+        migrations.RunPython(count_registrations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_prefix_indexes(apps, schema_editor):
+    # Serve email/reg_number __iexact and __istartswith, which Django compiles
+    # to UPPER(col::text) = / LIKE, from an index on PostgreSQL
+    if schema_editor.connection.vendor == 'postgresql':
+        for column in ('email', 'reg_number'):
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS alumni_{column}_upper_prefix '
+                f'ON alumni_alumni (UPPER({column}::text) text_pattern_ops)'
+            )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for column in ('email', 'reg_number'):
+            schema_editor.execute(f'DROP INDEX IF EXISTS alumni_{column}_upper_prefix')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0024_content_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
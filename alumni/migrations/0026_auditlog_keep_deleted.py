@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0025_alumni_identifier_prefix_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='alumni',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_logs', to='alumni.alumni'),
+        ),
+    ]
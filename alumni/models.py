@@ -1,4 +1,5 @@
-from django.db import models
+import copy
+from django.db import connections, models, transaction
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator, EmailValidator, URLValidator
 from datetime import datetime
@@ -20,17 +21,24 @@ class AuditLog(models.Model):
         ('view', 'Viewed')
     ]
     
-    alumni = models.ForeignKey('Alumni', on_delete=models.CASCADE, related_name='audit_logs')
+    # Kept (unlinked) when the record is deleted; the 'delete' entry names it in changed_fields
+    alumni = models.ForeignKey('Alumni', on_delete=models.SET_NULL, null=True, blank=True, related_name='audit_logs')
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     action = models.CharField(max_length=10, choices=ACTION_TYPES)
     timestamp = models.DateTimeField(auto_now_add=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
-    changed_fields = models.TextField(blank=True, help_text='JSON of changed fields and their values')
+    changed_fields = models.JSONField(default=dict, blank=True, help_text='Changed fields and their values')
     reason = models.TextField(blank=True, help_text='Reason for the change')
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # Retention scans and archival (see alumni/archive.py)
+            models.Index(fields=['timestamp', 'id'], name='auditlog_timestamp_id_idx'),
+            # One alumnus's history, newest first (admin portal audit browser)
+            models.Index(fields=['alumni', 'timestamp', 'id'], name='auditlog_alumni_ts_idx'),
+        ]
         verbose_name = _('Audit Log')
         verbose_name_plural = _('Audit Logs')
 
@@ -83,8 +91,12 @@ class Alumni(models.Model):
     last_name = models.CharField(max_length=100)
     gender = models.CharField(max_length=10, choices=[('M', 'Male'), ('F', 'Female')])
     date_of_birth = models.DateField(null=True, blank=True)
+    # month * 100 + day of date_of_birth, kept in sync on save (see alumni/birthdays.py)
+    birthday_key = models.PositiveSmallIntegerField(null=True, blank=True, db_index=True, editable=False)
     maiden_name = models.CharField(max_length=100, blank=True, null=True, verbose_name='Maiden Name')
     national_id = models.CharField(max_length=50, help_text="National ID/Passport Number")
+    # Keyed hash of the normalized national ID, used for lookups (see alumni/lookup.py)
+    national_id_key = models.CharField(max_length=64, blank=True, db_index=True, editable=False)
     
     # Contact Information
     email = models.EmailField(unique=True)
@@ -158,23 +170,228 @@ class Alumni(models.Model):
                                              verbose_name='Stay Informed')
     interest_other = models.BooleanField(default=False, verbose_name='Other Interest')
     interest_other_details = models.TextField(blank=True, verbose_name='Please specify other interest')
+    # Bitmask of the interest_* flags above (bit order: INTEREST_FIELDS), kept in sync on save
+    interest_mask = models.PositiveSmallIntegerField(default=0, db_index=True, editable=False)
     bio = models.TextField(blank=True)
     profile_picture = models.ImageField(upload_to='alumni_profile_pictures/', blank=True, null=True)
     
+    # Normalized text of the searchable fields, maintained on save (see alumni/search.py)
+    search_document = models.TextField(blank=True, editable=False)
+    
+    INTEREST_FIELDS = (
+        'interest_networking',
+        'interest_academic',
+        'interest_career',
+        'interest_giving_back',
+        'interest_stay_informed',
+        'interest_other',
+    )
+    
     class Meta:
         verbose_name_plural = "Alumni"
+        indexes = [
+            # Keyset pagination keys for the admin alumni list
+            models.Index(fields=['registration_date', 'id'], name='alumni_regdate_id_idx'),
+            models.Index(fields=['last_name', 'id'], name='alumni_lastname_id_idx'),
+            models.Index(fields=['graduation_year', 'id'], name='alumni_gradyear_id_idx'),
+            # Admin list filters
+            models.Index(fields=['country'], name='alumni_country_idx'),
+            models.Index(fields=['degree_level'], name='alumni_degree_level_idx'),
+            models.Index(fields=['employment_status'], name='alumni_employment_idx'),
+            models.Index(fields=['programme_studied'], name='alumni_programme_idx'),
+            models.Index(fields=['is_verified', 'registration_date'], name='alumni_verified_regdate_idx'),
+        ]
     
     def __str__(self):
         if self.first_name and self.last_name:
             return f"{self.first_name} {self.last_name} ({self.reg_number})"
         return self.reg_number
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded values so saves can be diffed without re-reading the row
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None:
+            self._remember_loaded_values()
+        elif hasattr(self, '_loaded_values'):
+            # Deferred fields loaded on access join the snapshot
+            for name in fields:
+                field = self._meta.get_field(name)
+                self._loaded_values[field.attname] = self._stored_value(field)
+
+    def _stored_value(self, field):
+        value = self.__dict__[field.attname]
+        if isinstance(field, models.FileField) and value is not None:
+            return getattr(value, 'name', value)
+        return value
+
+    def _remember_loaded_values(self):
+        self._loaded_values = {
+            field.attname: self._stored_value(field)
+            for field in self._meta.concrete_fields if field.attname in self.__dict__
+        }
+
+    def _remember_saved_values(self, using):
+        """Snapshot the row just written, keeping the previous snapshot until the transaction commits."""
+        previous = self.__dict__.get('_loaded_values')
+        self._remember_loaded_values()
+        connection = connections[using]
+        if not connection.in_atomic_block:
+            return
+        pending = self.__dict__.setdefault('_pending_snapshots', [])
+        hook = lambda: pending.clear()
+        transaction.on_commit(hook, using=using)
+        pending.append((previous, hook, using))
+
+    def _discard_rolled_back_snapshots(self):
+        """Restore the snapshot from before saves whose transaction (or savepoint) rolled back."""
+        pending = self.__dict__.get('_pending_snapshots')
+        while pending:
+            previous, hook, using = pending[-1]
+            # The hook is cleared from run_on_commit by a rollback; on commit it empties ``pending``
+            if any(entry[1] is hook for entry in connections[using].run_on_commit):
+                break
+            pending.pop()
+            if previous is None:
+                self.__dict__.pop('_loaded_values', None)
+            else:
+                self._loaded_values = previous
+
+    def get_changed_fields(self):
+        """
+        Return ``{field_name: (old, new)}`` for fields that differ from the loaded row.
+
+        Returns None when the instance was not loaded from the database.
+        Deferred fields that were never assigned are not compared.
+        """
+        self._discard_rolled_back_snapshots()
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return None
+        changes = {}
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue
+            new = self._stored_value(field)
+            old = loaded.get(field.attname)
+            changed = field.attname not in loaded or old != new
+            if isinstance(field, models.FileField):
+                # A fresh upload can reuse the old file name
+                changed = changed or not getattr(self.__dict__[field.attname], '_committed', True)
+            if changed:
+                changes[field.name] = (old, new)
+        return changes
+
+    def get_loaded_instance(self):
+        """Return a copy of this record as it was loaded, or None if it wasn't loaded from the database."""
+        self._discard_rolled_back_snapshots()
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return None
+        previous = copy.copy(self)
+        previous.__dict__.update(loaded)
+        return previous
+
+    def save(self, *args, **kwargs):
+        from .birthdays import birthday_key
+        from .lookup import national_id_key
+        from .search import SEARCH_FIELDS, build_search_document
+        self.search_document = build_search_document(self)
+        self.birthday_key = birthday_key(self.date_of_birth)
+        self.national_id_key = national_id_key(self.national_id)
+        self.interest_mask = self.compute_interest_mask()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            changes = self.get_changed_fields()
+            if changes is not None:
+                # Only write the columns that changed; an empty list skips the save entirely
+                kwargs['update_fields'] = list(changes)
+        elif update_fields is not None:
+            update_fields = set(update_fields)
+            if update_fields & set(SEARCH_FIELDS):
+                update_fields.add('search_document')
+            if 'national_id' in update_fields:
+                update_fields.add('national_id_key')
+            if 'date_of_birth' in update_fields:
+                update_fields.add('birthday_key')
+            if update_fields & set(self.INTEREST_FIELDS):
+                update_fields.add('interest_mask')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        self._remember_saved_values(self._state.db)
+
+    def compute_interest_mask(self):
+        """Pack the interest flags into a bitmask (bit i = INTEREST_FIELDS[i])."""
+        return sum(1 << bit for bit, field in enumerate(self.INTEREST_FIELDS) if getattr(self, field))
+
+
+class AlumniSearchTrigram(models.Model):
+    """Inverted trigram index used for alumni search on databases without pg_trgm."""
+    alumni = models.ForeignKey(Alumni, on_delete=models.CASCADE, related_name='search_trigrams')
+    trigram = models.CharField(max_length=3)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['trigram', 'alumni'], name='alumni_search_trigram_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.trigram!r} -> {self.alumni_id}"
+
+
+class AlumniRollup(models.Model):
+    """Pre-aggregated alumni counts per dimension value, maintained incrementally (see alumni/rollups.py)."""
+    dimension = models.CharField(max_length=30)
+    value = models.CharField(max_length=200, blank=True)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'value'], name='unique_alumni_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.value}: {self.total}"
+
+
+class RegistrationDailyBucket(models.Model):
+    """Registrations per day, graduation cohort and programme, maintained like AlumniRollup."""
+    day = models.DateField()
+    graduation_year = models.PositiveIntegerField()
+    programme_studied = models.CharField(max_length=200)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'graduation_year', 'programme_studied'],
+                name='unique_registration_bucket'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.graduation_year} {self.programme_studied}: {self.total}"
+
 
 class Newsletter(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
     published_date = models.DateTimeField(default=timezone.now)
     attachment = models.FileField(upload_to='newsletter_attachments/', blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Newsletter archive and home page, newest first
+            models.Index(fields=['published_date', 'id'], name='newsletter_published_idx'),
+            # Conditional GET validators (alumni/conditional.py)
+            models.Index(fields=['updated_at'], name='newsletter_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -190,19 +407,59 @@ class Event(models.Model):
     registration_required = models.BooleanField(default=False)
     created_date = models.DateTimeField(default=timezone.now)
     image = models.ImageField(upload_to='event_images/', blank=True, null=True)
+    capacity = models.PositiveIntegerField(null=True, blank=True, help_text='Leave blank for unlimited places')
+    # Confirmed registrations, maintained with atomic updates (see alumni/rsvp.py)
+    confirmed_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date'], name='event_date_idx'),
+            models.Index(fields=['updated_at'], name='event_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Never write back a stale confirmed_count from an instance loaded before a registration
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'confirmed_count'
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def places_left(self):
+        """Remaining places, or None when the event has no capacity limit."""
+        if self.capacity is None:
+            return None
+        return max(0, self.capacity - self.confirmed_count)
+
 
 class EventRegistration(models.Model):
+    CONFIRMED = 'confirmed'
+    WAITLISTED = 'waitlisted'
+    CANCELLED = 'cancelled'
+    STATUS_CHOICES = [
+        (CONFIRMED, 'Confirmed'),
+        (WAITLISTED, 'Waitlisted'),
+        (CANCELLED, 'Cancelled'),
+    ]
+
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='registrations')
     alumni = models.ForeignKey(Alumni, on_delete=models.CASCADE, related_name='event_registrations')
     registration_date = models.DateTimeField(default=timezone.now)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=CONFIRMED)
     attended = models.BooleanField(default=False)
     
     class Meta:
         unique_together = ('event', 'alumni')
+        indexes = [
+            # Waitlist order
+            models.Index(fields=['event', 'status', 'registration_date'], name='eventreg_waitlist_idx'),
+        ]
     
     def __str__(self):
         return f"{self.alumni} - {self.event}"
@@ -218,9 +475,13 @@ class AlumniStory(models.Model):
     photo = models.ImageField(upload_to='alumni_stories_photos/', blank=True, null=True)
     published_date = models.DateTimeField(default=timezone.now)
     is_published = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-published_date']
+        indexes = [
+            models.Index(fields=['updated_at'], name='alumnistory_updated_idx'),
+        ]
         verbose_name = _('Alumni Story')
         verbose_name_plural = _('Alumni Stories')
 
@@ -243,9 +504,13 @@ class SocialLink(models.Model):
     icon = models.CharField(max_length=100, blank=True, help_text='Path to icon in static or external URL')
     order = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['updated_at'], name='sociallink_updated_idx'),
+        ]
         verbose_name = _('Social Link')
         verbose_name_plural = _('Social Links')
 
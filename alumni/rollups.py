@@ -0,0 +1,198 @@
+"""
+Incrementally maintained alumni rollups.
+
+``AlumniRollup`` holds one row per (dimension, value) with the number of
+alumni in that group. Save/delete signals apply +1/-1 deltas for the groups a
+record enters or leaves, so reports read O(groups) rows instead of scanning
+the Alumni table. Writes that bypass signals (``QuerySet.update``, raw SQL)
+can cause drift; ``manage.py rebuild_rollups`` recomputes everything.
+
+Interests are rolled up by ``interest_mask`` so per-interest counts and
+co-occurrence can both be derived from the same (at most 64) rows.
+
+``RegistrationDailyBucket`` is maintained the same way and holds
+registrations per day x graduation cohort x programme for time-series reports.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Trunc, TruncDate
+from django.utils import timezone
+
+from .models import Alumni, AlumniRollup, RegistrationDailyBucket
+
+ROLLUP_DIMENSIONS = (
+    'country',
+    'graduation_year',
+    'degree_level',
+    'employment_status',
+    'is_verified',
+    'interest_mask',
+)
+
+
+def _as_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return str(value)
+
+
+def rollup_groups(alumni):
+    """Return the set of ``(dimension, value)`` groups a record counts towards."""
+    return {(dimension, _as_value(getattr(alumni, dimension))) for dimension in ROLLUP_DIMENSIONS}
+
+
+def group_deltas(before=(), after=()):
+    """Return the deltas for a record moving from the ``before`` groups to the ``after`` groups."""
+    deltas = Counter()
+    for group in set(before) - set(after):
+        deltas[group] -= 1
+    for group in set(after) - set(before):
+        deltas[group] += 1
+    return deltas
+
+
+def bucket_key(alumni):
+    """Return the ``(day, graduation_year, programme)`` registration bucket of a record."""
+    day = timezone.localtime(alumni.registration_date).date() if timezone.is_aware(alumni.registration_date) \
+        else alumni.registration_date.date()
+    return (day, alumni.graduation_year, (alumni.programme_studied or '').strip())
+
+
+def rollup_snapshot(alumni):
+    """Capture everything a record contributes to the rollup tables."""
+    return rollup_groups(alumni), bucket_key(alumni)
+
+
+def record_changes(changes):
+    """
+    Apply the net effect of ``(before, after)`` snapshot pairs to the rollup tables.
+
+    ``before`` is None for new records and ``after`` is None for deleted ones.
+    """
+    group_totals = Counter()
+    bucket_totals = Counter()
+    for before, after in changes:
+        before_groups, before_bucket = before or ((), None)
+        after_groups, after_bucket = after or ((), None)
+        group_totals.update(group_deltas(before_groups, after_groups))
+        if before_bucket != after_bucket:
+            if before_bucket is not None:
+                bucket_totals[before_bucket] -= 1
+            if after_bucket is not None:
+                bucket_totals[after_bucket] += 1
+    apply_deltas(group_totals)
+    apply_bucket_deltas(bucket_totals)
+
+
+def _apply(model, lookups, delta):
+    rows = model.objects.filter(**lookups)
+    if rows.update(total=F('total') + delta):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(total=delta, **lookups)
+    except IntegrityError:
+        # Another writer created the row first
+        rows.update(total=F('total') + delta)
+
+
+def apply_deltas(deltas):
+    """Apply ``{(dimension, value): delta}`` to the rollup table."""
+    for (dimension, value), delta in sorted(deltas.items()):
+        if delta:
+            _apply(AlumniRollup, {'dimension': dimension, 'value': value}, delta)
+
+
+def apply_bucket_deltas(deltas):
+    """Apply ``{(day, graduation_year, programme): delta}`` to the daily buckets."""
+    for (day, graduation_year, programme), delta in sorted(deltas.items()):
+        if delta:
+            _apply(RegistrationDailyBucket, {
+                'day': day, 'graduation_year': graduation_year, 'programme_studied': programme
+            }, delta)
+
+
+def rebuild_rollups():
+    """Recompute every rollup row and daily bucket from the Alumni table; returns the number of rows."""
+    rows = []
+    for dimension in ROLLUP_DIMENSIONS:
+        grouped = Alumni.objects.order_by().values_list(dimension).annotate(total=Count('pk'))
+        rows.extend(
+            AlumniRollup(dimension=dimension, value=_as_value(value), total=total)
+            for value, total in grouped
+        )
+
+    bucket_totals = Counter()
+    grouped = (
+        Alumni.objects.order_by()
+        .annotate(day=TruncDate('registration_date'))
+        .values_list('day', 'graduation_year', 'programme_studied')
+        .annotate(total=Count('pk'))
+    )
+    for day, graduation_year, programme, total in grouped:
+        bucket_totals[(day, graduation_year, (programme or '').strip())] += total
+    buckets = [
+        RegistrationDailyBucket(day=day, graduation_year=graduation_year, programme_studied=programme, total=total)
+        for (day, graduation_year, programme), total in bucket_totals.items()
+    ]
+
+    with transaction.atomic():
+        AlumniRollup.objects.all().delete()
+        AlumniRollup.objects.bulk_create(rows)
+        RegistrationDailyBucket.objects.all().delete()
+        RegistrationDailyBucket.objects.bulk_create(buckets, batch_size=2000)
+    return len(rows) + len(buckets)
+
+
+def rollup_counts(dimension):
+    """Return ``[(value, total), ...]`` for a dimension, largest groups first."""
+    return list(
+        AlumniRollup.objects
+        .filter(dimension=dimension, total__gt=0)
+        .order_by('-total', 'value')
+        .values_list('value', 'total')
+    )
+
+
+def interest_histogram():
+    """Return ``{interest_mask: count}`` from the rollup table."""
+    return {int(value): total for value, total in rollup_counts('interest_mask')}
+
+
+SERIES_INTERVALS = ('day', 'week', 'month')
+SERIES_GROUPS = {
+    'none': (),
+    'graduation_year': ('graduation_year',),
+    'programme': ('programme_studied',),
+    'cohort': ('graduation_year', 'programme_studied'),
+}
+
+
+def registration_series(start=None, end=None, interval='day', group_by='none'):
+    """
+    Sum daily buckets into ``interval`` periods between ``start`` and ``end`` (inclusive dates).
+
+    Returns ``[(period, group, total), ...]`` ordered by period, where
+    ``group`` is a tuple of the ``group_by`` values (empty when ungrouped).
+    """
+    group_fields = SERIES_GROUPS[group_by]
+    buckets = RegistrationDailyBucket.objects.filter(total__gt=0)
+    if start:
+        buckets = buckets.filter(day__gte=start)
+    if end:
+        buckets = buckets.filter(day__lte=end)
+    if interval == 'day':
+        buckets = buckets.annotate(period=F('day'))
+    else:
+        buckets = buckets.annotate(period=Trunc('day', interval))
+    rows = (
+        buckets.order_by()
+        .values_list('period', *group_fields)
+        .annotate(registrations=Sum('total'))
+        .order_by('period', *group_fields)
+    )
+    return [(row[0], tuple(row[1:-1]), row[-1]) for row in rows]
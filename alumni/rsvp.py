@@ -0,0 +1,118 @@
+"""
+Event registration with a capacity limit and a waitlist.
+
+Places are claimed with a single conditional UPDATE on ``Event.confirmed_count``
+(``... WHERE confirmed_count < capacity``), so the event row is only locked
+for the length of that statement's transaction and concurrent registrations
+can never overbook. A registration is written as waitlisted first and
+confirmed in the same transaction once a place has been claimed; the claim is
+the last write, which keeps the event row lock as short as possible. Every
+change to the count also stamps ``Event.updated_at`` so the event pages'
+validators move (see alumni/conditional.py).
+
+When a confirmed registration is cancelled (or the capacity is raised) the
+oldest waitlisted registrations are promoted one at a time. Each promotion
+locks its candidate with ``SELECT ... FOR UPDATE SKIP LOCKED`` so parallel
+promoters pick different rows instead of queueing behind each other.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Event, EventRegistration
+
+
+class RegistrationClosed(Exception):
+    """The event does not take registrations (any more)."""
+
+
+def check_open(event):
+    if not event.registration_required:
+        raise RegistrationClosed("This event does not require registration.")
+    if event.date < timezone.now():
+        raise RegistrationClosed("Registration for this event has closed.")
+
+
+def _claim_place(event_id):
+    """Take one place if one is free; returns False when the event is full."""
+    return Event.objects.filter(
+        Q(capacity__isnull=True) | Q(confirmed_count__lt=F('capacity')), pk=event_id,
+    ).update(confirmed_count=F('confirmed_count') + 1, updated_at=timezone.now()) == 1
+
+
+def register(event, alumni):
+    """
+    Register ``alumni`` for ``event``, confirmed if a place is free and waitlisted otherwise.
+
+    Registering again returns the existing registration; a cancelled
+    registration is reactivated at the back of the waitlist.
+    """
+    check_open(event)
+    registration = EventRegistration.objects.filter(event=event, alumni=alumni).first()
+    if registration is not None and registration.status != EventRegistration.CANCELLED:
+        return registration
+
+    try:
+        with transaction.atomic():
+            if registration is None:
+                registration = EventRegistration.objects.create(
+                    event=event, alumni=alumni, status=EventRegistration.WAITLISTED,
+                )
+            else:
+                now = timezone.now()
+                reactivated = EventRegistration.objects.filter(
+                    pk=registration.pk, status=EventRegistration.CANCELLED,
+                ).update(status=EventRegistration.WAITLISTED, registration_date=now, attended=False)
+                if not reactivated:
+                    # Reactivated by a concurrent request
+                    return EventRegistration.objects.get(pk=registration.pk)
+                registration.status, registration.registration_date = EventRegistration.WAITLISTED, now
+            if _claim_place(event.pk):
+                EventRegistration.objects.filter(pk=registration.pk).update(status=EventRegistration.CONFIRMED)
+                registration.status = EventRegistration.CONFIRMED
+    except IntegrityError:
+        # A concurrent request created the registration first
+        return EventRegistration.objects.get(event=event, alumni=alumni)
+
+    if registration.status == EventRegistration.WAITLISTED:
+        # A place may have been released while this registration was uncommitted
+        if any(promoted.pk == registration.pk for promoted in promote_waitlist(event.pk)):
+            registration.status = EventRegistration.CONFIRMED
+    return registration
+
+
+def cancel(event, alumni):
+    """Cancel the registration of ``alumni``, promoting from the waitlist; returns it, or None if there was none."""
+    registration = EventRegistration.objects.filter(event=event, alumni=alumni).first()
+    if registration is None or registration.status == EventRegistration.CANCELLED:
+        return None
+
+    with transaction.atomic():
+        active = EventRegistration.objects.filter(pk=registration.pk)
+        if active.filter(status=EventRegistration.CONFIRMED).update(status=EventRegistration.CANCELLED):
+            Event.objects.filter(pk=event.pk).update(confirmed_count=F('confirmed_count') - 1, updated_at=timezone.now())
+        elif not active.filter(status=EventRegistration.WAITLISTED).update(status=EventRegistration.CANCELLED):
+            # Cancelled by a concurrent request
+            return None
+    registration.status = EventRegistration.CANCELLED
+    promote_waitlist(event.pk)
+    return registration
+
+
+def promote_waitlist(event_id):
+    """Confirm waitlisted registrations, oldest first, while places are free; returns those promoted."""
+    promoted = []
+    while True:
+        with transaction.atomic():
+            candidate = (
+                EventRegistration.objects.select_for_update(skip_locked=True)
+                .filter(event_id=event_id, status=EventRegistration.WAITLISTED)
+                .order_by('registration_date', 'pk')
+                .first()
+            )
+            if candidate is None or not _claim_place(event_id):
+                break
+            EventRegistration.objects.filter(pk=candidate.pk).update(status=EventRegistration.CONFIRMED)
+        candidate.status = EventRegistration.CONFIRMED
+        promoted.append(candidate)
+    return promoted
@@ -0,0 +1,147 @@
+"""
+Ranked, typo-tolerant search over Alumni records.
+
+Every Alumni row keeps a normalized ``search_document`` built from the fields
+staff search on. On PostgreSQL that column carries a ``pg_trgm`` GIN index and
+queries use the word-similarity operator, so matching and ranking are answered
+from the index. Other backends (SQLite test runs) fall back to an equivalent
+inverted index: one ``AlumniSearchTrigram`` row per distinct trigram of the
+document, indexed by trigram, scored by how many of the query's trigrams match.
+"""
+import re
+import unicodedata
+
+from django.db import connection, transaction
+from django.db.models import Count, F, FloatField, Value
+from django.db.models.functions import Cast
+
+from .models import Alumni, AlumniSearchTrigram
+
+SEARCH_FIELDS = (
+    'first_name', 'last_name', 'maiden_name', 'programme_studied',
+    'current_employer', 'job_title', 'city',
+)
+
+# Minimum share of query trigrams a record must contain to be returned
+MIN_SIMILARITY = 0.3
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_text(value):
+    """Lower-case, strip accents and collapse anything non-alphanumeric to single spaces."""
+    if not value:
+        return ''
+    value = unicodedata.normalize('NFKD', str(value))
+    value = value.encode('ascii', 'ignore').decode('ascii').lower()
+    return _NON_ALNUM.sub(' ', value).strip()
+
+
+def build_search_document(alumni):
+    """Return the normalized text indexed for an Alumni instance."""
+    parts = (normalize_text(getattr(alumni, field, '')) for field in SEARCH_FIELDS)
+    return ' '.join(part for part in parts if part)
+
+
+def trigrams(text):
+    """Split normalized text into trigrams the same way pg_trgm does (padded per word)."""
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def uses_trigram_index():
+    """Whether the database can serve searches from a pg_trgm index."""
+    return connection.vendor == 'postgresql'
+
+
+def index_alumni(alumni_list):
+    """
+    Rebuild the fallback inverted index for the given Alumni instances.
+
+    No-op on PostgreSQL, where the trigram index on ``search_document`` is
+    maintained by the database itself.
+    """
+    if uses_trigram_index():
+        return
+    alumni_list = [alumni for alumni in alumni_list if alumni.pk]
+    if not alumni_list:
+        return
+    rows = [
+        AlumniSearchTrigram(alumni_id=alumni.pk, trigram=gram)
+        for alumni in alumni_list
+        for gram in trigrams(alumni.search_document or build_search_document(alumni))
+    ]
+    with transaction.atomic():
+        AlumniSearchTrigram.objects.filter(alumni_id__in=[a.pk for a in alumni_list]).delete()
+        AlumniSearchTrigram.objects.bulk_create(rows, batch_size=1000)
+
+
+def filter_matches(queryset, query):
+    """
+    Restrict ``queryset`` to every record matching ``query``, unranked and unsliced.
+
+    The match is a SQL filter, so the result can be streamed however large it is.
+    """
+    text = normalize_text(query)
+    if not text:
+        return queryset.none()
+    if uses_trigram_index():
+        return queryset.filter(search_document__trigram_word_similar=text)
+    grams = trigrams(text)
+    matching_ids = (
+        AlumniSearchTrigram.objects
+        .filter(trigram__in=grams)
+        .values('alumni_id')
+        .annotate(hits=Count('id'))
+        .annotate(score=Cast(F('hits'), FloatField()) / Value(float(len(grams))))
+        .filter(score__gte=MIN_SIMILARITY)
+        .values('alumni_id')
+    )
+    return queryset.filter(pk__in=matching_ids)
+
+
+def search_alumni(query, queryset=None, limit=50):
+    """
+    Return up to ``limit`` Alumni matching ``query``, best matches first.
+
+    Each result carries a ``search_rank`` attribute between 0 and 1.
+    ``queryset`` can pre-filter or restrict the loaded columns.
+    """
+    if queryset is None:
+        queryset = Alumni.objects.all()
+    text = normalize_text(query)
+    if not text:
+        return []
+
+    if uses_trigram_index():
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        results = (
+            queryset
+            .filter(search_document__trigram_word_similar=text)
+            .annotate(search_rank=TrigramWordSimilarity(text, 'search_document'))
+            .order_by('-search_rank', '-pk')
+        )
+        return list(results[:limit])
+
+    grams = trigrams(text)
+    matches = (
+        AlumniSearchTrigram.objects
+        # Restrict to the caller's rows before ranking, so the cut below can't drop them
+        .filter(trigram__in=grams, alumni_id__in=queryset.order_by().values('pk'))
+        .values('alumni_id')
+        .annotate(hits=Count('id'))
+        .annotate(score=Cast(F('hits'), FloatField()) / Value(float(len(grams))))
+        .filter(score__gte=MIN_SIMILARITY)
+        .order_by('-score', '-alumni_id')
+        .values_list('alumni_id', 'score')
+    )
+    ranked = dict(matches[:limit])
+    results = list(queryset.filter(pk__in=ranked))
+    for alumni in results:
+        alumni.search_rank = ranked[alumni.pk]
+    results.sort(key=lambda a: (-a.search_rank, -a.pk))
+    return results[:limit]
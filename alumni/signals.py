@@ -1,45 +1,39 @@
 """
 Signal handlers for the Alumni app with fixed user assignment to prevent AnonymousUser errors.
 """
-import json
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
-from .models import Alumni, AuditLog
-
-def get_client_ip(request):
-    """Get client IP address from request object."""
-    if not request:
-        return None
-        
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+from . import audit
+from .audit import UNAUDITED_FIELDS, get_client_ip
+from .models import Alumni, Event, IAROContent, IAROObjective, Newsletter
+from .cache import DASHBOARD, HOME, bump_on_commit
+from .search import index_alumni
+from .rollups import record_changes, rollup_snapshot
 
 @receiver(pre_save, sender=Alumni)
 def alumni_pre_save(sender, instance, **kwargs):
-    """Track changes before saving an Alumni record."""
-    if instance.pk:
+    """Track changes before saving an Alumni record, diffing against the values it was loaded with."""
+    if not instance.pk:
+        return
+    old_instance = instance.get_loaded_instance()
+    if old_instance is None:
+        # Not loaded from the database (e.g. built by hand with a pk); fall back to reading the row
         try:
             old_instance = Alumni.objects.get(pk=instance.pk)
-            changes = {}
-            for field in instance._meta.fields:
-                field_name = field.name
-                if field_name in ['id', 'registration_date']:  # Skip these fields
-                    continue
-                old_value = getattr(old_instance, field_name, None)
-                new_value = getattr(instance, field_name, None)
-                if old_value != new_value:
-                    changes[field_name] = {
-                        'old': str(old_value),
-                        'new': str(new_value)
-                    }
-            if changes:
-                instance._change = changes
         except Alumni.DoesNotExist:
-            pass
+            return
+        old_instance._remember_loaded_values()
+        instance._loaded_values = old_instance._loaded_values
+        changes = instance.get_changed_fields()
+        del instance._loaded_values
+    else:
+        changes = instance.get_changed_fields()
+    # Remember which report groups the stored row counts towards
+    instance._rollup_before = rollup_snapshot(old_instance)
+    instance._change = {
+        name: {'old': str(old), 'new': str(new)}
+        for name, (old, new) in changes.items() if name not in UNAUDITED_FIELDS
+    }
 
 @receiver(post_save, sender=Alumni)
 def alumni_post_save(sender, instance, created, **kwargs):
@@ -54,40 +48,60 @@ def alumni_post_save(sender, instance, created, **kwargs):
     except:
         pass
     
-    # Create audit log entry
-    try:
-        AuditLog.objects.create(
-            alumni=instance,
-            user=None,  # Always use None to avoid AnonymousUser errors
-            action=action,
-            ip_address=get_client_ip(request) if request else None,
-            user_agent=request.META.get('HTTP_USER_AGENT', '') if request else '',
-            changed_fields=json.dumps(getattr(instance, '_change', {}), default=str),
-            reason=getattr(instance, '_change_reason', '')
-        )
-    except Exception as e:
-        print(f"Failed to create audit log in signal handler: {e}")
+    # Queue the audit entry; it is written in one batch when the transaction commits
+    audit.log(
+        instance,
+        action,
+        changed_fields=getattr(instance, '_change', None),
+        reason=getattr(instance, '_change_reason', ''),
+        ip_address=get_client_ip(request) if request else None,
+        user_agent=request.META.get('HTTP_USER_AGENT', '') if request else '',
+    )
+
+@receiver(post_save, sender=Alumni)
+def alumni_search_index(sender, instance, **kwargs):
+    """Keep the fallback search index in step with the saved record."""
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'search_document' not in update_fields:
+        return
+    index_alumni([instance])
+
+@receiver(post_save, sender=Alumni)
+def alumni_rollups_post_save(sender, instance, created, **kwargs):
+    """Move the record between rollup groups and daily buckets as its reported fields change."""
+    before = getattr(instance, '_rollup_before', None)
+    if created:
+        before = ()
+    elif before is None:
+        return
+    record_changes([(before or None, rollup_snapshot(instance))])
+    instance._rollup_before = None
+
+@receiver(post_delete, sender=Alumni)
+def alumni_rollups_post_delete(sender, instance, **kwargs):
+    """Remove a deleted record from its rollup groups."""
+    record_changes([(rollup_snapshot(instance), None)])
+
+@receiver([post_save, post_delete], sender=Alumni)
+@receiver([post_save, post_delete], sender=Newsletter)
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_dashboard(sender, **kwargs):
+    """Drop cached dashboard counters when the rows they count change."""
+    bump_on_commit(DASHBOARD)
+
+@receiver([post_save, post_delete], sender=Newsletter)
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=IAROContent)
+@receiver([post_save, post_delete], sender=IAROObjective)
+def invalidate_home(sender, **kwargs):
+    """Drop the cached home page content when anything it shows changes."""
+    bump_on_commit(HOME)
 
 @receiver(post_delete, sender=Alumni)
 def alumni_post_delete(sender, instance, **kwargs):
-    """Log when an Alumni record is deleted."""
-    # Get the request object if available
-    request = None
-    try:
-        if hasattr(instance, '_request'):
-            request = instance._request
-    except:
-        pass
-    
-    # Create audit log entry
-    try:
-        AuditLog.objects.create(
-            alumni=instance,
-            user=None,  # Always use None to avoid AnonymousUser errors
-            action='delete',
-            ip_address=get_client_ip(request) if request else None,
-            user_agent=request.META.get('HTTP_USER_AGENT', '') if request else '',
-            reason=getattr(instance, '_delete_reason', '')
-        )
-    except Exception as e:
-        print(f"Failed to create audit log in signal handler: {e}")
+    """Record the deletion of an Alumni record.
+
+    Its AuditLog rows are kept with ``alumni`` set to NULL, so the entry names
+    the record it was about in ``changed_fields``.
+    """
+    audit.log(instance, 'delete', {'alumni_id': instance.pk, 'reg_number': instance.reg_number})
@@ -9,11 +9,13 @@ urlpatterns = [
     path('update/<int:pk>/full/', views.FullUpdateView.as_view(), name='update_full'),
     path('', views.HomePageView.as_view(), name='home'),
     path('register/', views.RegistrationView.as_view(), name='register'),
+    path('reference/countries.json', views.CountriesView.as_view(), name='countries'),
     path('success/', views.SuccessView.as_view(), name='success'),
     path('newsletters/', views.NewslettersView.as_view(), name='newsletters'),
     path('newsletters/<int:pk>/', views.NewsletterDetailView.as_view(), name='newsletter_detail'),
     path('events/', views.EventsView.as_view(), name='events'),
     path('events/<int:pk>/', views.EventDetailView.as_view(), name='event_detail'),
+    path('events/<int:pk>/rsvp/', views.EventRSVPView.as_view(), name='event_rsvp'),
     path('stories/', views.StoriesView.as_view(), name='stories'),
     path('connect/', views.ConnectView.as_view(), name='connect'),
     path('donate/', views.DonateView.as_view(), name='donate'),
@@ -1,29 +1,49 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views import View
 from django.contrib import messages
+from . import cache, countries, rsvp
+from .conditional import content_condition, last_event_start, table_signature
 from .audit_helpers import create_alumni_audit_log
-from .forms import AlumniRegistrationForm, AlumniFullUpdateForm, DonationForm
+from .lookup import find_alumni_by_national_id
+from .forms import AlumniRegistrationForm, AlumniFullUpdateForm, DonationForm, EventRSVPForm
 from .models import AlumniStory, SocialLink
-from .models import Alumni, Newsletter, Event, IAROContent
+from .models import Alumni, Newsletter, Event, EventRegistration, IAROContent
+from django.core.paginator import Paginator
+from django.db.models import Count
+from django.db.models.functions import ExtractYear, Left
 from django.utils import timezone
-import pycountry
 from django.utils.deprecation import MiddlewareMixin
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
 import json
 
+HOME_CACHE_TIMEOUT = 600
+
+
+def build_home_context():
+    """Load everything the home page shows, fully evaluated so it can be cached."""
+    return {
+        'newsletters': list(Newsletter.objects.order_by('-published_date')[:3]),
+        'upcoming_events': list(Event.objects.filter(date__gte=timezone.now()).order_by('date')[:3]),
+        # Get active IARO content with its objectives
+        'iaro': IAROContent.objects.filter(is_active=True).prefetch_related('objectives').first(),
+    }
+
+
+def home_cache_timeout(context):
+    """Expire no later than the moment the next upcoming event drops off the page."""
+    events = context['upcoming_events']
+    if not events:
+        return HOME_CACHE_TIMEOUT
+    remaining = (events[0].date - timezone.now()).total_seconds()
+    return max(1, min(HOME_CACHE_TIMEOUT, int(remaining) + 1))
+
+
 class HomePageView(View):
     def get(self, request):
-        newsletters = Newsletter.objects.order_by('-published_date')[:3]
-        upcoming_events = Event.objects.filter(date__gte=timezone.now()).order_by('date')[:3]
-        
-        # Get active IARO content with its objectives
-        iaro_content = IAROContent.objects.filter(is_active=True).first()
-        
-        context = {
-            'newsletters': newsletters,
-            'upcoming_events': upcoming_events,
-            'iaro': iaro_content,
-        }
+        # Invalidated by the Newsletter/Event/IAROContent/IAROObjective signals
+        context = cache.get_or_compute(cache.HOME, 'context', build_home_context, timeout=home_cache_timeout)
         return render(request, 'alumni/home.html', context)
 
 
@@ -37,28 +57,24 @@ class RegistrationView(View):
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
+
+    @staticmethod
+    def get_context(form):
+        """Template context for the registration form; country data is built once per process."""
+        now = timezone.now()
+        return {
+            'form': form,
+            'now': now,
+            # The full list is fetched from CountriesView; only a submitted choice is rendered here
+            'country_selected_option': countries.selected_option_html(form['country'].value()),
+            'countries_version': countries.version(),
+            'year_choices': list(range(2000, now.year + 3))
+        }
         
     def get(self, request):
         form = AlumniRegistrationForm()
         
-        # Load all ISO countries (alpha_2 code + common name)
-        countries_sorted = sorted(
-            (
-                {
-                    'code': c.alpha_2,
-                    'name': getattr(c, 'common_name', None) or getattr(c, 'name', '')
-                }
-                for c in pycountry.countries
-            ),
-            key=lambda x: x['name']
-        )
-        
-        context = {
-            'form': form,
-            'now': timezone.now(),
-            'countries': countries_sorted,
-            'year_choices': list(range(2000, timezone.now().year + 3))
-        }
+        context = self.get_context(form)
         return render(request, 'alumni/registration.html', context)
     
     def post(self, request):
@@ -67,14 +83,9 @@ class RegistrationView(View):
             alumni = form.save(commit=False)
             
             # Handle the country and city fields from Select2
-            country_code = request.POST.get('country')
-            if country_code:
-                try:
-                    country_obj = pycountry.countries.get(alpha_2=country_code)
-                    if country_obj:
-                        alumni.country = getattr(country_obj, 'common_name', None) or country_obj.name
-                except Exception:
-                    pass
+            country_name = countries.country_name(request.POST.get('country'))
+            if country_name:
+                alumni.country = country_name
             
             # Handle city (can be a predefined value or custom input)
             city = request.POST.get('city')
@@ -138,76 +149,90 @@ class RegistrationView(View):
                     request,
                     "An error occurred during registration. Please try again or contact support if the problem persists."
                 )
-                # Add all necessary context for the form template
-                countries_sorted = sorted(
-                    (
-                        {
-                            'code': c.alpha_2,
-                            'name': getattr(c, 'common_name', None) or getattr(c, 'name', '')
-                        }
-                        for c in pycountry.countries
-                    ),
-                    key=lambda x: x['name']
-                )
-                context = {
-                    'form': form,
-                    'now': timezone.now(),
-                    'countries': countries_sorted,
-                    'year_choices': list(range(2000, timezone.now().year + 3))
-                }
+                context = self.get_context(form)
                 return render(request, 'alumni/registration.html', context)
             
-        # Get the same context as in get() method
-        countries_sorted = sorted(
-            (
-                {
-                    'code': c.alpha_2,
-                    'name': getattr(c, 'common_name', None) or getattr(c, 'name', '')
-                }
-                for c in pycountry.countries
-            ),
-            key=lambda x: x['name']
-        )
-        context = {
-            'form': form,
-            'now': timezone.now(),
-            'countries': countries_sorted,
-            'year_choices': list(range(2000, timezone.now().year + 3))
-        }
+        context = self.get_context(form)
         return render(request, 'alumni/registration.html', context)
 
 
 # Removed BioFormView as we've combined both forms into one
 
 
+class CountriesView(View):
+    """Country reference data as JSON; immutable when requested with the current ``?v=`` version."""
+
+    def get(self, request):
+        etag = f'"{countries.version()}"'
+        if etag in [tag.strip() for tag in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(countries.countries_json(), content_type='application/json')
+        response['ETag'] = etag
+        if request.GET.get('v') == countries.version():
+            patch_cache_control(response, public=True, max_age=365 * 24 * 3600, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=3600)
+        return response
+
+
 class SuccessView(View):
     def get(self, request):
         return render(request, 'alumni/success.html')
 
 
+@method_decorator(content_condition(Newsletter), name='get')
 class NewslettersView(View):
+    """Newsletter archive, paginated, with per-year counts for the year picker."""
+    paginate_by = 12
+    excerpt_length = 400  # enough for the 25-word teaser without loading whole bodies
+
+    @staticmethod
+    def year_counts():
+        """``[(year, count), ...]`` newest first, from one grouped query."""
+        return list(
+            Newsletter.objects.annotate(year=ExtractYear('published_date'))
+            .values_list('year').annotate(total=Count('pk')).order_by('-year')
+        )
+
     def get(self, request):
+        # Keyed by the table's state so a change made by any process is picked up
+        count, latest = table_signature(Newsletter)
+        signature = f'{count}:{latest.timestamp() if latest else 0:.6f}'
+        year_counts = cache.get_or_compute(cache.CONTENT, f'newsletter_years:{signature}', self.year_counts)
         year = request.GET.get('year')
-        newsletters_qs = Newsletter.objects.all()
-        if year and year.isdigit():
-            newsletters_qs = newsletters_qs.filter(published_date__year=year)
-        newsletters = newsletters_qs.order_by('-published_date')
+        selected_year = int(year) if year and year.isdigit() else None
+
+        newsletters_qs = Newsletter.objects.only('id', 'title', 'published_date', 'attachment')
+        if selected_year:
+            newsletters_qs = newsletters_qs.filter(published_date__year=selected_year)
+            total = dict(year_counts).get(selected_year, 0)
+        else:
+            total = sum(count for _, count in year_counts)
+        newsletters_qs = newsletters_qs.annotate(excerpt=Left('content', self.excerpt_length))
+
+        paginator = Paginator(newsletters_qs.order_by('-published_date', '-id'), self.paginate_by)
+        paginator.count = total  # already known from the year counts; skips a COUNT query
+        page = paginator.get_page(request.GET.get('page'))
 
-        years = Newsletter.objects.dates('published_date', 'year', order='DESC')
         context = {
-            'newsletters': newsletters,
-            'years': [d.year for d in years],
-            'selected_year': int(year) if year and year.isdigit() else None,
+            'newsletters': page,
+            'page': page,
+            'year_counts': year_counts,
+            'years': [y for y, _ in year_counts],
+            'selected_year': selected_year,
         }
         return render(request, 'alumni/newsletters.html', context)
 
 
+@method_decorator(content_condition(Newsletter), name='get')
 class NewsletterDetailView(View):
     def get(self, request, pk):
         newsletter = get_object_or_404(Newsletter, pk=pk)
         return render(request, 'alumni/newsletter_detail.html', {'newsletter': newsletter})
 
 
+@method_decorator(content_condition(Event, changed_at=last_event_start), name='get')
 class EventsView(View):
     def get(self, request):
         events = Event.objects.filter(date__gte=timezone.now()).order_by('date')
@@ -220,6 +245,7 @@ class EventsView(View):
         return render(request, 'alumni/events.html', context)
 
 
+@method_decorator(content_condition(Event, changed_at=last_event_start), name='get')
 class EventDetailView(View):
     def get(self, request, pk):
         event = get_object_or_404(Event, pk=pk)
@@ -230,6 +256,39 @@ class EventDetailView(View):
         return render(request, 'alumni/event_detail.html', context)
 
 
+class EventRSVPView(View):
+    """Register for an event, or cancel a registration, and report the outcome on the event page."""
+    def post(self, request, pk):
+        event = get_object_or_404(Event, pk=pk)
+        form = EventRSVPForm(request.POST)
+        if not form.is_valid():
+            messages.error(request, "Please enter a valid email address and registration number.")
+            return redirect('alumni:event_detail', pk=event.pk)
+        alumni = form.get_alumni()
+        if alumni is None:
+            messages.error(request, "We couldn't find an alumni record with that email and registration number.")
+            return redirect('alumni:event_detail', pk=event.pk)
+
+        if form.cleaned_data['action'] == EventRSVPForm.CANCEL:
+            if rsvp.cancel(event, alumni) is None:
+                messages.info(request, "You don't have an active registration for this event.")
+            else:
+                messages.success(request, "Your registration has been cancelled.")
+            return redirect('alumni:event_detail', pk=event.pk)
+
+        try:
+            registration = rsvp.register(event, alumni)
+        except rsvp.RegistrationClosed as exc:
+            messages.error(request, str(exc))
+        else:
+            if registration.status == EventRegistration.CONFIRMED:
+                messages.success(request, "You're registered for this event. See you there!")
+            else:
+                messages.info(request, "This event is full, so you've been added to the waitlist. "
+                                       "You'll get a place automatically if one becomes available.")
+        return redirect('alumni:event_detail', pk=event.pk)
+
+
 # ------------------ Self-service Update Flow ------------------
 
 class QuickUpdateView(View):
@@ -249,21 +308,14 @@ class QuickUpdateView(View):
             messages.error(request, 'National ID is required.')
             return render(request, self.template_name, {'full_form': AlumniFullUpdateForm()})
 
-        try:
-            alumni = Alumni.objects.get(national_id=national_id)
-        except Alumni.DoesNotExist:
+        alumni = find_alumni_by_national_id(national_id)
+        if alumni is None:
             messages.error(request, 'No alumni record found with that National ID. You can register instead.')
             context = {'register_url': 'alumni:register', 'full_form': AlumniFullUpdateForm()}
             return render(request, self.template_name, context)
 
         # If user chose full update, delegate to form
         if update_type == 'full':
-            try:
-                alumni = Alumni.objects.get(national_id=national_id)
-            except Alumni.DoesNotExist:
-                messages.error(request, 'No alumni record found with that National ID. You can register instead.')
-                context = {'full_form': AlumniFullUpdateForm(request.POST)}
-                return render(request, self.template_name, context)
             form = AlumniFullUpdateForm(request.POST, request.FILES, instance=alumni)
             if form.is_valid():
                 form.save()
@@ -321,9 +373,8 @@ class UpdateLookupView(View):
         if not national_id:
             messages.error(request, 'Please enter your National ID / Passport number.')
             return render(request, self.template_name, {'full_form': AlumniFullUpdateForm()})
-        try:
-            alumni = Alumni.objects.get(national_id=national_id)
-        except Alumni.DoesNotExist:
+        alumni = find_alumni_by_national_id(national_id)
+        if alumni is None:
             messages.error(request, 'No alumni record found with that National ID. Would you like to register first?')
             return render(request, self.template_name, {
                 'registration_url': 'alumni:register'
@@ -382,6 +433,7 @@ class FullUpdateView(View):
 
 
 # ------------------ Alumni Engagement Pages ------------------
+@method_decorator(content_condition(AlumniStory), name='get')
 class StoriesView(View):
     """Display inspiring alumni stories."""
     template_name = 'alumni/stories.html'
@@ -391,6 +443,7 @@ class StoriesView(View):
         return render(request, self.template_name, {"stories": stories})
 
 
+@method_decorator(content_condition(SocialLink), name='get')
 class ConnectView(View):
     """Show social / messaging groups alumni can join."""
     template_name = 'alumni/connect.html'
@@ -10,3 +10,6 @@ python manage.py collectstatic --no-input
 
 # Apply any outstanding database migrations
 python manage.py migrate
+
+# Recompute national ID lookup keys if NATIONAL_ID_HASH_KEY changed (no-op otherwise)
+python manage.py rebuild_national_id_keys
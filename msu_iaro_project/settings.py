@@ -6,6 +6,7 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 # Load environment variables from .env file
 load_dotenv()
@@ -16,6 +17,12 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv('SECRET_KEY', 'django-insecure-secret-key-change-in-production')
 
+# Key for the national ID lookup hash (alumni/lookup.py). Required in production
+# so rotating SECRET_KEY doesn't orphan the stored keys; in development it falls
+# back to SECRET_KEY. After changing it, run
+# ``python manage.py rebuild_national_id_keys`` (build.sh does on every deploy).
+NATIONAL_ID_HASH_KEY = os.getenv('NATIONAL_ID_HASH_KEY', '')
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.getenv('DEBUG', 'True').lower() in ['true', '1', 'yes']
 
@@ -36,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'tailwind',
     'alumni',
     'admin_portal',
@@ -50,6 +58,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'alumni.audit.AuditMiddleware',  # Batch audit log writes per request
 ]
 
 ROOT_URLCONF = 'msu_iaro_project.urls'
@@ -96,6 +105,26 @@ else:
         }
     }
 
+# Cache
+# Generation counters used for invalidation must be shared by every worker,
+# so production should point REDIS_URL at a shared Redis instance (needs the
+# redis package).
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -132,8 +161,30 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Email
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', '25'))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'False').lower() in ['true', '1', 'yes']
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'MSU IARO <noreply@msu.ac.zw>')
+
+# SMS (see admin_portal/sms.py) and outbox delivery rates in messages per second
+SMS_BACKEND = os.getenv('SMS_BACKEND', 'admin_portal.sms.ConsoleBackend')
+OUTBOX_RATE_LIMITS = {
+    'email': float(os.getenv('OUTBOX_EMAIL_RATE', '20')),
+    'sms': float(os.getenv('OUTBOX_SMS_RATE', '5')),
+}
+
+# Audit log retention (see alumni/archive.py and manage.py archive_audit_logs)
+AUDIT_LOG_RETENTION_DAYS = int(os.getenv('AUDIT_LOG_RETENTION_DAYS', '730'))
+AUDIT_ARCHIVE_DIR = os.getenv('AUDIT_ARCHIVE_DIR', os.path.join(BASE_DIR, 'archive', 'audit'))
+
 # Security settings for production
 if not DEBUG:
+    if not NATIONAL_ID_HASH_KEY:
+        raise ImproperlyConfigured("NATIONAL_ID_HASH_KEY must be set when DEBUG is off.")
     SECURE_BROWSER_XSS_FILTER = True
     SECURE_CONTENT_TYPE_NOSNIFF = True
     SECURE_HSTS_INCLUDE_SUBDOMAINS = True